@@ -1,14 +1,25 @@
 from app.agents.base import BaseAgent
-from typing import Dict, Any, List
+from app.core.config import settings
+from typing import Dict, Any, Awaitable, List, Optional, TypeVar
+import asyncio
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 class BackendDeveloperAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, limiter: Optional[asyncio.Semaphore] = None):
         super().__init__("backend_developer", "api_builder")
         self.supported_frameworks = ["fastapi", "flask", "django", "express"]
+        # One slot per LLM call. The coordinator passes its AGENT_CONCURRENCY semaphore,
+        # so per-file calls count against the same cap as every other agent call.
+        self.limiter = limiter or asyncio.Semaphore(settings.AGENT_CONCURRENCY)
+    
+    async def _limited(self, call: Awaitable[T]) -> T:
+        async with self.limiter:
+            return await call
         
     async def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         task_type = task.get("type", "generate_backend")
@@ -48,7 +59,7 @@ class BackendDeveloperAgent(BaseAgent):
         Follow best practices for {framework}.
         """
         
-        backend_design = await self.groq_service.complete(prompt)
+        backend_design = await self._limited(self.groq_service.complete(prompt))
         
         files = await self._generate_backend_files(
             backend_design, 
@@ -58,12 +69,17 @@ class BackendDeveloperAgent(BaseAgent):
             framework
         )
         
+        dependencies, deployment_config = await asyncio.gather(
+            self._limited(self._extract_dependencies(backend_design, framework)),
+            self._generate_deployment_config(framework)
+        )
+        
         return {
             "framework": framework,
             "design": backend_design,
             "files": files,
-            "dependencies": await self._extract_dependencies(backend_design, framework),
-            "deployment_config": await self._generate_deployment_config(framework)
+            "dependencies": dependencies,
+            "deployment_config": deployment_config
         }
     
     async def _generate_backend_files(
@@ -93,27 +109,45 @@ class BackendDeveloperAgent(BaseAgent):
         integrations: List
     ) -> Dict[str, str]:
         
-        files = {}
-        
-        files["main.py"] = await self._generate_fastapi_main(requirements)
-        
-        files["config.py"] = await self._generate_config(requirements, integrations)
+        # Every file is its own LLM call with no dependency on the others
+        jobs = {
+            "main.py": self._generate_fastapi_main(requirements),
+            "config.py": self._generate_config(requirements, integrations)
+        }
         
         for table in schema.get("tables", []):
             model_name = table["name"]
-            files[f"models/{model_name}.py"] = await self._generate_model(table, "fastapi")
-            files[f"routes/{model_name}.py"] = await self._generate_routes(table, "fastapi")
-            files[f"services/{model_name}_service.py"] = await self._generate_service(table)
+            jobs[f"models/{model_name}.py"] = self._generate_model(table, "fastapi")
+            jobs[f"routes/{model_name}.py"] = self._generate_routes(table, "fastapi")
+            jobs[f"services/{model_name}_service.py"] = self._generate_service(table)
         
-        files["auth/auth.py"] = await self._generate_auth_system("fastapi", requirements)
+        jobs["auth/auth.py"] = self._generate_auth_system("fastapi", requirements)
         
-        for integration in integrations:
-            integration_type = integration.get("type", "unknown")
-            files[f"integrations/{integration_type}.py"] = await self._generate_integration(integration)
+        # Same-type integrations share one file and the last one wins;
+        # pick it before starting calls so no result is thrown away
+        by_path = {
+            f"integrations/{integration.get('type', 'unknown')}.py": integration
+            for integration in integrations
+        }
+        for path, integration in by_path.items():
+            jobs[path] = self._generate_integration(integration)
         
-        files["requirements.txt"] = await self._generate_requirements("fastapi", integrations)
+        jobs["requirements.txt"] = self._generate_requirements("fastapi", integrations)
         
-        return files
+        return await self._gather_files(jobs)
+    
+    async def _gather_files(self, jobs: Dict[str, Awaitable[str]]) -> Dict[str, str]:
+        """Await file generations concurrently, each holding a slot of the shared limiter.
+        
+        The first failure cancels the files still being generated.
+        """
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = {path: group.create_task(self._limited(job)) for path, job in jobs.items()}
+        except ExceptionGroup as errors:
+            # Callers report the failure itself, not the group wrapping it
+            raise errors.exceptions[0]
+        return {path: task.result() for path, task in tasks.items()}
     
     async def _generate_fastapi_main(self, requirements: Dict) -> str:
         prompt = f"""
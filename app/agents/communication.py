@@ -20,6 +20,9 @@ class CommunicationAgent(BaseAgent):
     async def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Process with comprehensive system understanding"""
         
+        if task.get("type") == "extract_requirements_and_integrations":
+            return await self._extract_requirements_and_integrations(task.get("consultation", {}))
+        
         message = task.get("message", "").strip()
         session_data = task.get("session_data", {})
         
@@ -113,6 +116,27 @@ class CommunicationAgent(BaseAgent):
             "progress_details": self._get_progress_details(extracted_info, progress_result)
         }
     
+    async def _extract_requirements_and_integrations(self, consultation: Dict) -> Dict:
+        """Derive build requirements and needed tool integrations in one AI call"""
+        
+        prompt = f"""
+Turn this consultation into build requirements and the external tool integrations the application needs.
+
+Consultation: {json.dumps(consultation, indent=2)}
+
+Return a JSON object with:
+- requirements: object with entities, features, user_roles, backend_framework and frontend_framework
+- integrations: list of objects with a "type" (one of: notion, slack, google, github, custom) and a short "purpose"
+
+Only include integrations the business mentioned or clearly needs.
+"""
+        
+        result = await self.think_json(prompt)
+        return {
+            "requirements": result.get("requirements", {}),
+            "integrations": result.get("integrations", [])
+        }
+    
     def _is_cli_command(self, message: str) -> bool:
         """Only handle actual CLI commands locally"""
         commands = ['help', 'status', 'metrics', 'generate', 'exit']
@@ -285,7 +309,7 @@ Don't repeat existing information unless it's been clarified or quantified.
 
             allowed = True
             if claims_deploy or claims_url:
-                allowed = allowed and (build_status not in ("idle", "planning", "analyzing")) and ready_for_generation
+                allowed = allowed and (build_status not in ("idle", "queued", "analyzing", "planning_architecture")) and ready_for_generation
             if claims_building:
                 allowed = allowed and ready_for_generation
             if claims_time_guarantee:
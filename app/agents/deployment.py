@@ -2,9 +2,75 @@ from app.agents.base import BaseAgent
 from typing import Dict, Any, List
 import json
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# docker-compose service blocks; the file only varies by which services exist
+_COMPOSE_DB = """  db:
+    image: postgres:15-alpine
+    environment:
+      POSTGRES_USER: ${DB_USER:?missing}
+      POSTGRES_PASSWORD: ${DB_PASSWORD:?missing}
+      POSTGRES_DB: ${DB_NAME:?missing}
+    volumes:
+      - postgres_data:/var/lib/postgresql/data
+    ports:
+      - "5432:5432"
+    healthcheck:
+      test: ["CMD-SHELL", "pg_isready -U appuser"]
+      interval: 10s
+      timeout: 5s
+      retries: 5"""
+
+_COMPOSE_BACKEND = """  backend:
+    build: ./backend
+    ports:
+      - "8000:8000"
+    environment:
+      DATABASE_URL: ${DATABASE_URL:?missing}
+      JWT_SECRET: ${JWT_SECRET:?missing}
+    depends_on:
+      db:
+        condition: service_healthy
+    volumes:
+      - ./backend:/app
+    command: uvicorn app.main:app --reload --host 0.0.0.0 --port 8000"""
+
+_COMPOSE_FRONTEND = """  frontend:
+    build: ./frontend
+    ports:
+      - "3000:80"
+    environment:
+      VITE_API_URL: ${API_URL:-http://localhost:8000}
+    depends_on:
+      - backend"""
+
+_COMPOSE_HEADER = """version: '3.8'
+
+services:
+"""
+
+_COMPOSE_FOOTER = """
+
+volumes:
+  postgres_data:
+
+networks:
+  default:
+    name: app_network
+"""
+
+@lru_cache(maxsize=None)
+def _docker_compose(has_backend: bool, has_frontend: bool) -> str:
+    """Render the compose file once per service combination"""
+    services = [_COMPOSE_DB]
+    if has_backend:
+        services.append(_COMPOSE_BACKEND)
+    if has_frontend:
+        services.append(_COMPOSE_FRONTEND)
+    return _COMPOSE_HEADER + "\n".join(services) + _COMPOSE_FOOTER
+
 class DeploymentAgent(BaseAgent):
     """
     Deployment Agent - Handles deployment and DevOps tasks
@@ -155,61 +221,7 @@ CMD ["nginx", "-g", "daemon off;"]
 """
     
     async def _generate_docker_compose(self, components: Dict) -> str:
-        services = []
-        
-        services.append("""  db:
-    image: postgres:15-alpine
-    environment:
-      POSTGRES_USER: ${DB_USER:?missing}
-      POSTGRES_PASSWORD: ${DB_PASSWORD:?missing}
-      POSTGRES_DB: ${DB_NAME:?missing}
-    volumes:
-      - postgres_data:/var/lib/postgresql/data
-    ports:
-      - "5432:5432"
-    healthcheck:
-      test: ["CMD-SHELL", "pg_isready -U appuser"]
-      interval: 10s
-      timeout: 5s
-      retries: 5""")
-        
-        if "backend" in components:
-            services.append("""  backend:
-    build: ./backend
-    ports:
-      - "8000:8000"
-    environment:
-      DATABASE_URL: ${DATABASE_URL:?missing}
-      JWT_SECRET: ${JWT_SECRET:?missing}
-    depends_on:
-      db:
-        condition: service_healthy
-    volumes:
-      - ./backend:/app
-    command: uvicorn app.main:app --reload --host 0.0.0.0 --port 8000""")
-        
-        if "frontend" in components:
-            services.append("""  frontend:
-    build: ./frontend
-    ports:
-      - "3000:80"
-    environment:
-      VITE_API_URL: ${API_URL:-http://localhost:8000}
-    depends_on:
-      - backend""")
-        
-        return f"""version: '3.8'
-
-services:
-{chr(10).join(services)}
-
-volumes:
-  postgres_data:
-
-networks:
-  default:
-    name: app_network
-"""
+        return _docker_compose("backend" in components, "frontend" in components)
     
     async def _generate_kubernetes_manifests(self, components: Dict) -> Dict[str, str]:
         manifests = {}
@@ -1,5 +1,6 @@
 from app.agents.base import BaseAgent
 from typing import Dict, Any, List
+import asyncio
 import json
 import logging
 
@@ -29,17 +30,19 @@ class MCPIntegrationAgent(BaseAgent):
         if tool_type not in self.supported_tools:
             raise ValueError(f"Unsupported tool: {tool_type}")
         
-        capabilities = await self._discover_mcp_capabilities(tool_type)
-        
-        connector_code = await self._generate_tool_connector(
-            tool_type, 
-            requirements, 
-            capabilities
-        )
-        
-        setup_instructions = await self._generate_setup_instructions(
-            tool_type,
-            requirements
+        async def _capabilities_and_connector():
+            capabilities = await self._discover_mcp_capabilities(tool_type)
+            connector_code = await self._generate_tool_connector(
+                tool_type, 
+                requirements, 
+                capabilities
+            )
+            return capabilities, connector_code
+        
+        # Setup instructions don't depend on the discovered capabilities
+        (capabilities, connector_code), setup_instructions = await asyncio.gather(
+            _capabilities_and_connector(),
+            self._generate_setup_instructions(tool_type, requirements)
         )
         
         return {
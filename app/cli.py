@@ -85,7 +85,7 @@ class MiosaCLI:
                 if normalized == 'generate' or any(alias == normalized for alias in build_aliases):
                     # Check if session is ready for generation
                     if self.session_id:
-                        session = self.coordinator.get_session(self.session_id)
+                        session = await self.coordinator.get_session(self.session_id)
                         if session and session.get('ready_for_generation'):
                             await self._generate_application()
                         else:
@@ -104,6 +104,9 @@ class MiosaCLI:
             except Exception as e:
                 console.print(f"\n[red]❌ Error: {e}[/red]")
                 console.print("[dim]Type 'help' for assistance[/dim]")
+        
+        # Stop background planning and persist writes still waiting on the flush
+        await self.coordinator.shutdown()
     
     async def _process_message(self, message: str):
         """Process user message through consultation"""
@@ -189,22 +192,26 @@ class MiosaCLI:
             task = progress.add_task("[cyan]Generating application...", total=100)
             
             try:
-                # Update progress through stages
-                stages = [
-                    ("Extracting requirements", 10),
-                    ("Designing database", 25),
-                    ("Generating backend", 50),
-                    ("Creating frontend", 75),
-                    ("Setting up integrations", 90),
-                    ("Finalizing deployment", 100)
-                ]
+                # Progress advances as each pipeline stage reports back
+                stage_progress = {
+                    "requirements": ("Designing database", 25),
+                    "database": ("Generating backend", 40),
+                    "backend": ("Setting up integrations", 60),
+                    "mcp_connectors": ("Creating frontend", 75),
+                    "frontend": ("Finalizing deployment", 90),
+                    "deployment": ("Finalizing deployment", 100)
+                }
+                progress.update(task, description="[cyan]Extracting requirements...", completed=10)
                 
-                for stage_name, progress_value in stages:
-                    progress.update(task, description=f"[cyan]{stage_name}...", completed=progress_value)
-                    await asyncio.sleep(0.5)  # Simulate work
-                
-                # Actually generate the application
-                result = await self.coordinator.generate_application(self.session_id)
+                result = None
+                async for event in self.coordinator.generate_application_stream(self.session_id):
+                    if event["stage"] == "error":
+                        raise RuntimeError(event["error"])
+                    if event["stage"] == "complete":
+                        result = {"status": "success", **event["result"]}
+                    else:
+                        stage_name, progress_value = stage_progress[event["stage"]]
+                        progress.update(task, description=f"[cyan]{stage_name}...", completed=progress_value)
                 
                 progress.update(task, completed=100, description="[green]✅ Complete!")
                 
@@ -1,6 +1,6 @@
 # app/core/config.py
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, computed_field
+from pydantic import Field, computed_field, model_validator
 from functools import lru_cache
 
 class Settings(BaseSettings):
@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "MIOSA"
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
+    DEBUG: bool = Field(default=False)
+    WORKERS: int = Field(default=1)
     
     # Security
     SECRET_KEY: str = Field(..., validation_alias="SECRET_KEY")
@@ -34,10 +36,31 @@ class Settings(BaseSettings):
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
     
+    # Session storage: "file" (local JSON), "sqlite" (single WAL database) or "redis" (shared across workers)
+    SESSION_BACKEND: str = Field(default="file")
+    SESSION_TTL_SECONDS: int = Field(default=30 * 24 * 3600)
+    # Sessions kept in process memory before least recently used ones are evicted
+    SESSION_CACHE_SIZE: int = Field(default=1024)
+    # Debounce window for coalescing consultation session writes
+    SESSION_FLUSH_INTERVAL: float = Field(default=0.5)
+    # fsync every session save (file and sqlite backends); off trades the last saves on power loss for speed
+    SESSION_DURABLE_WRITES: bool = Field(default=False)
+    
     # Groq API (with Kimi K2 support)
     GROQ_API_KEY: str = Field(..., validation_alias="GROQ_API_KEY")
     GROQ_MODEL: str = Field(default="moonshotai/kimi-k2-instruct")  # Kimi K2 through Groq
     
+    # Generation
+    MCP_CONCURRENCY: int = Field(default=8)
+    # Max concurrent generation agent calls (LLM-backed) across all sessions
+    AGENT_CONCURRENCY: int = Field(default=4)
+    # Max background planning runs in flight; further triggers wait their turn
+    PLANNING_CONCURRENCY: int = Field(default=4)
+    # Seconds a background planning agent call may take before the plan is marked partial
+    PLANNING_STAGE_TIMEOUT: float = Field(default=60.0)
+    # Hand /generate requests to app.worker via a Redis Stream (needs SESSION_BACKEND=redis)
+    GENERATION_QUEUE: bool = Field(default=False)
+    
     # Frontend
     FRONTEND_URL: str = Field(default="http://localhost:5173")
     
@@ -47,6 +70,13 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = Field(default="INFO")
     
+    @model_validator(mode="after")
+    def _queue_needs_shared_sessions(self) -> "Settings":
+        # Workers on file or sqlite storage would generate against their own local sessions
+        if self.GENERATION_QUEUE and self.SESSION_BACKEND != "redis":
+            raise ValueError("GENERATION_QUEUE requires SESSION_BACKEND=redis")
+        return self
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -30,6 +30,10 @@ class Priority(str, Enum):
     URGENT = "urgent"
 
 
+# Conversation turns kept in a session's history; older messages move to its archive
+MAX_SESSION_MESSAGES = 200
+
+
 # System prompts
 SYSTEM_PROMPTS = {
     "general": """You are MIOSA, a helpful AI assistant. 
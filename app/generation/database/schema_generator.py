@@ -2,12 +2,68 @@
 Database Schema Generator - Creates SQL schemas from requirements
 """
 
+from collections import deque
 from typing import Dict, List, Any
-import json
+
+def _mentions(req: Dict, token: str) -> bool:
+    """Case-insensitive search for token in the string keys and leaves of req"""
+    pending = deque([req])
+    while pending:
+        node = pending.popleft()
+        if isinstance(node, str):
+            if token in node.lower():
+                return True
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(key, str) and token in key.lower():
+                    return True
+                pending.append(value)
+        elif isinstance(node, (list, tuple, set)):
+            pending.extend(node)
+    return False
+
+# Seed SQL keyed by table name
+_SEED_DATA = {
+    "users": """
+INSERT INTO users (email, password_hash, full_name, is_active, role) VALUES
+('admin@example.com', '$2b$12$hash', 'Admin User', true, 'admin'),
+('user@example.com', '$2b$12$hash', 'Test User', true, 'user');
+""",
+    "products": """
+INSERT INTO products (name, description, price, sku, stock_quantity) VALUES
+('Product 1', 'Description for product 1', 99.99, 'PROD001', 100),
+('Product 2', 'Description for product 2', 149.99, 'PROD002', 50);
+"""
+}
 
 class SchemaGenerator:
     """Generates database schemas from requirements"""
     
+    # DDL templates, built once instead of per statement
+    _CREATE_TABLE_TPL = "CREATE TABLE {name} (\n{columns}\n);"
+    _FK_TPL = (
+        "ALTER TABLE {t_from}\n"
+        "ADD CONSTRAINT fk_{t_from}_{t_to}\n"
+        "FOREIGN KEY ({fk})\n"
+        "REFERENCES {t_to}(id)\n"
+        "ON DELETE CASCADE;"
+    )
+    _IDX_TPL = "CREATE {unique}INDEX {name} ON {table} ({cols});"
+    
+    # Column flag -> DDL suffix, applied in this order
+    _FLAG_SUFFIX = (
+        ("primary_key", " PRIMARY KEY"),
+        ("required", " NOT NULL"),
+        ("unique", " UNIQUE")
+    )
+    # Default value formatting keyed on the value's concrete type
+    _DEFAULT_FMT = {
+        bool: lambda v: str(v).upper(),
+        int: str,
+        float: str,
+        str: lambda v: v if v == "CURRENT_TIMESTAMP" else f"'{v}'"
+    }
+    
     def __init__(self):
         self.db_types = ["postgresql", "mysql", "sqlite"]
         
@@ -37,7 +93,7 @@ class SchemaGenerator:
         entities = []
         
         # Extract from business requirements
-        if "user" in str(requirements).lower():
+        if _mentions(requirements, "user"):
             entities.append({
                 "name": "users",
                 "fields": [
@@ -150,42 +206,33 @@ class SchemaGenerator:
         columns_sql = []
         
         for column in table["columns"]:
-            col_sql = f"    {column['name']} {column['type']}"
+            parts = [f"    {column['name']} {column['type']}"]
+            parts += [suffix for flag, suffix in self._FLAG_SUFFIX if column.get(flag)]
             
-            if column.get("primary_key"):
-                col_sql += " PRIMARY KEY"
-            if column.get("required"):
-                col_sql += " NOT NULL"
-            if column.get("unique"):
-                col_sql += " UNIQUE"
             if "default" in column:
                 default_val = column["default"]
-                if isinstance(default_val, bool):
-                    default_val = str(default_val).upper()
-                elif isinstance(default_val, str) and default_val != "CURRENT_TIMESTAMP":
-                    default_val = f"'{default_val}'"
-                col_sql += f" DEFAULT {default_val}"
+                parts.append(f" DEFAULT {self._DEFAULT_FMT.get(type(default_val), str)(default_val)}")
             
-            columns_sql.append(col_sql)
+            columns_sql.append("".join(parts))
         
-        return f"""CREATE TABLE {table['name']} (
-{','.join(columns_sql)}
-);"""
+        return self._CREATE_TABLE_TPL.format(name=table["name"], columns=",".join(columns_sql))
     
     async def _generate_foreign_key_sql(self, relationship: Dict, db_type: str) -> str:
         """Generate foreign key constraint"""
-        return f"""ALTER TABLE {relationship['from']} 
-ADD CONSTRAINT fk_{relationship['from']}_{relationship['to']} 
-FOREIGN KEY ({relationship['foreign_key']}) 
-REFERENCES {relationship['to']}(id) 
-ON DELETE CASCADE;"""
+        return self._FK_TPL.format(
+            t_from=relationship["from"],
+            t_to=relationship["to"],
+            fk=relationship["foreign_key"]
+        )
     
     async def _generate_index_sql(self, index: Dict, db_type: str) -> str:
         """Generate CREATE INDEX statement"""
-        unique = "UNIQUE " if index.get("unique") else ""
-        columns = ", ".join(index["columns"])
-        
-        return f"CREATE {unique}INDEX {index['name']} ON {index['table']} ({columns});"
+        return self._IDX_TPL.format(
+            unique="UNIQUE " if index.get("unique") else "",
+            name=index["name"],
+            table=index["table"],
+            cols=", ".join(index["columns"])
+        )
     
     async def _create_entity_definition(self, entity_name: str, requirements: Dict) -> Dict:
         """Create entity definition from requirements"""
@@ -233,30 +280,12 @@ ON DELETE CASCADE;"""
         migrations["001_initial_migration_up.sql"] = schema["sql"]
         
         # Down migration
-        down_sql = []
-        for table in reversed(schema["tables"]):
-            down_sql.append(f"DROP TABLE IF EXISTS {table['name']} CASCADE;")
-        
-        migrations["001_initial_migration_down.sql"] = "\n".join(down_sql)
+        migrations["001_initial_migration_down.sql"] = "\n".join(
+            f"DROP TABLE IF EXISTS {table['name']} CASCADE;" for table in reversed(schema["tables"])
+        )
         
         return migrations
     
     async def generate_seed_data(self, schema: Dict) -> str:
         """Generate seed data for testing"""
-        seed_statements = []
-        
-        for table in schema["tables"]:
-            if table["name"] == "users":
-                seed_statements.append("""
-INSERT INTO users (email, password_hash, full_name, is_active, role) VALUES
-('admin@example.com', '$2b$12$hash', 'Admin User', true, 'admin'),
-('user@example.com', '$2b$12$hash', 'Test User', true, 'user');
-""")
-            elif table["name"] == "products":
-                seed_statements.append("""
-INSERT INTO products (name, description, price, sku, stock_quantity) VALUES
-('Product 1', 'Description for product 1', 99.99, 'PROD001', 100),
-('Product 2', 'Description for product 2', 149.99, 'PROD002', 50);
-""")
-        
-        return "\n".join(seed_statements)
\ No newline at end of file
+        return "\n".join(_SEED_DATA[t["name"]] for t in schema["tables"] if t["name"] in _SEED_DATA)
\ No newline at end of file
@@ -1,15 +1,21 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
-from datetime import datetime
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from typing import Optional
 import logging
+import time
 import uuid
-from typing import Dict, Any
+
+import orjson
 
 from app.core.config import settings
 from app.orchestration.coordinator import ApplicationGenerationCoordinator
+from app.agents.mcp_integration import MCPIntegrationAgent
+from app.orchestration.generation_queue import GenerationQueue
 
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
@@ -19,6 +25,32 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 coordinator = ApplicationGenerationCoordinator()
+mcp_agent = MCPIntegrationAgent()
+generation_queue = GenerationQueue(settings.REDIS_URL) if settings.GENERATION_QUEUE else None
+
+# (epoch second, ISO string) - /health rebuilds the timestamp at most once a second
+_ts_cache = [0, ""]
+
+def _health_timestamp() -> str:
+    now = time.time()
+    if int(now) != _ts_cache[0]:
+        _ts_cache[0] = int(now)
+        # Same shape as utcnow().isoformat(): naive UTC with microseconds
+        _ts_cache[1] = datetime.fromtimestamp(now, tz=timezone.utc).replace(tzinfo=None).isoformat()
+    return _ts_cache[1]
+
+class ConsultationStart(BaseModel):
+    message: str = Field(min_length=1)
+
+class ConsultationContinue(BaseModel):
+    session_id: str
+    message: str = ""
+
+class GenerateRequest(BaseModel):
+    session_id: str
+
+class ToolDiscover(BaseModel):
+    tool_type: str = Field(min_length=1)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -33,6 +65,7 @@ async def lifespan(app: FastAPI):
     
     yield
     
+    await coordinator.shutdown()
     logger.info("Shutting down MIOSA")
 
 app = FastAPI(
@@ -40,6 +73,7 @@ app = FastAPI(
     version=settings.VERSION,
     description="Generate complete applications through intelligent consultation",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json"
@@ -57,7 +91,7 @@ app.add_middleware(
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}", exc_info=exc)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
@@ -73,6 +107,7 @@ async def root():
         "endpoints": {
             "consultation": "/api/v1/consultation/start",
             "generate": "/api/v1/generate",
+            "generate_stream": "/api/v1/generate/stream",
             "sessions": "/api/v1/sessions"
         }
     }
@@ -86,7 +121,7 @@ async def health_check():
     return {
         "status": "healthy" if groq_health else "degraded",
         "version": settings.VERSION,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _health_timestamp(),
         "services": {
             "groq": "healthy" if groq_health else "unhealthy",
             "agents": "healthy",
@@ -95,15 +130,10 @@ async def health_check():
     }
 
 @app.post("/api/v1/consultation/start")
-async def start_consultation(request: Dict[str, Any]):
+async def start_consultation(payload: ConsultationStart):
     try:
         session_id = str(uuid.uuid4())
-        message = request.get("message", "")
-        
-        if not message:
-            raise HTTPException(status_code=400, detail="Message is required")
-        
-        result = await coordinator.start_consultation(session_id, message)
+        result = await coordinator.start_consultation(session_id, payload.message)
         
         return {
             "session_id": session_id,
@@ -117,15 +147,10 @@ async def start_consultation(request: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/v1/consultation/continue")
-async def continue_consultation(request: Dict[str, Any]):
+async def continue_consultation(payload: ConsultationContinue):
     try:
-        session_id = request.get("session_id")
-        message = request.get("message", "")
-        
-        if not session_id:
-            raise HTTPException(status_code=400, detail="Session ID is required")
-        
-        result = await coordinator.continue_consultation(session_id, message)
+        session_id = payload.session_id
+        result = await coordinator.continue_consultation(session_id, payload.message)
         
         return {
             "session_id": session_id,
@@ -140,14 +165,18 @@ async def continue_consultation(request: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/v1/generate")
-async def generate_application(request: Dict[str, Any]):
+async def generate_application(payload: GenerateRequest):
     try:
-        session_id = request.get("session_id")
-        
-        if not session_id:
-            raise HTTPException(status_code=400, detail="Session ID is required")
+        if generation_queue:
+            session = await coordinator.get_session(payload.session_id)
+            if not session or not session.get("ready_for_generation"):
+                raise HTTPException(status_code=400, detail="Consultation not complete")
+            # Workers read the session from shared storage, so write it out first
+            await coordinator.flush_sessions()
+            job_id = await generation_queue.enqueue(payload.session_id)
+            return {"status": "queued", "job_id": job_id}
         
-        result = await coordinator.generate_application(session_id)
+        result = await coordinator.generate_application(payload.session_id)
         
         if result.get("status") == "error":
             raise HTTPException(status_code=500, detail=result.get("error"))
@@ -164,14 +193,56 @@ async def generate_application(request: Dict[str, Any]):
                 "deployment": "Ready"
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating application: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/v1/generate/stream")
+async def generate_application_stream(payload: GenerateRequest):
+    """Stream one NDJSON event per completed generation stage"""
+    session = await coordinator.get_session(payload.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not session.get("ready_for_generation"):
+        raise HTTPException(status_code=400, detail="Consultation not complete")
+    
+    async def events():
+        async for event in coordinator.generate_application_stream(payload.session_id):
+            yield orjson.dumps(event, default=str) + b"\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/api/v1/sessions/{session_id}/build/events")
+async def build_events(session_id: str):
+    """Server-sent events with the background planning status as it changes"""
+    if not await coordinator.get_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    async def events():
+        async for status in coordinator.build_events(session_id):
+            yield b"data: " + orjson.dumps(status, default=str) + b"\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_generation_job(job_id: str):
+    if not generation_queue:
+        raise HTTPException(status_code=404, detail="Generation queue is disabled")
+    
+    job = await generation_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.get("status") == "completed":
+        # The worker saved the components; the session cached here predates them
+        await coordinator.refresh_generated_components(job["session_id"])
+    return job
+
 @app.get("/api/v1/sessions")
-async def list_sessions():
+async def list_sessions(limit: Optional[int] = Query(default=None, ge=1)):
     try:
-        sessions = coordinator.list_sessions()
+        sessions = await coordinator.list_sessions(limit)
         return {
             "sessions": sessions,
             "count": len(sessions)
@@ -183,7 +254,7 @@ async def list_sessions():
 @app.get("/api/v1/sessions/{session_id}")
 async def get_session(session_id: str):
     try:
-        session = coordinator.get_session(session_id)
+        session = await coordinator.get_session(session_id)
         
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -202,19 +273,11 @@ async def get_session(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/v1/tools/discover")
-async def discover_tool_capabilities(request: Dict[str, Any]):
+async def discover_tool_capabilities(payload: ToolDiscover):
     try:
-        tool_type = request.get("tool_type")
-        
-        if not tool_type:
-            raise HTTPException(status_code=400, detail="Tool type is required")
-        
-        from app.agents.mcp_integration import MCPIntegrationAgent
-        agent = MCPIntegrationAgent()
-        
-        result = await agent.process_task({
+        result = await mcp_agent.process_task({
             "type": "discover_capabilities",
-            "tool_type": tool_type
+            "tool_type": payload.tool_type
         })
         
         return result
@@ -224,10 +287,14 @@ async def discover_tool_capabilities(request: Dict[str, Any]):
 
 if __name__ == "__main__":
     import uvicorn
+    # In-memory sessions are per process; use SESSION_BACKEND=redis with WORKERS > 1
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        workers=settings.WORKERS,
+        loop="uvloop",
+        http="httptools",
+        reload=settings.DEBUG,
         log_level=settings.LOG_LEVEL.lower()
     )
\ No newline at end of file
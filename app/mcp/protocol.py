@@ -3,17 +3,19 @@ Model Context Protocol (MCP) Implementation
 Handles communication with external tools and services
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Protocol
 import json
 import asyncio
 import logging
-from abc import ABC, abstractmethod
+from uuid import uuid4
 
 logger = logging.getLogger(__name__)
 
 class MCPMessage:
     """Represents an MCP message"""
     
+    __slots__ = ("type", "tool", "operation", "data", "id")
+    
     def __init__(self, type: str, tool: str, operation: str, data: Dict[str, Any]):
         self.type = type  # request, response, event
         self.tool = tool
@@ -22,8 +24,7 @@ class MCPMessage:
         self.id = self._generate_id()
         
     def _generate_id(self) -> str:
-        import uuid
-        return str(uuid.uuid4())
+        return str(uuid4())
     
     def to_dict(self) -> Dict:
         return {
@@ -37,28 +38,24 @@ class MCPMessage:
     def to_json(self) -> str:
         return json.dumps(self.to_dict())
 
-class MCPConnector(ABC):
-    """Abstract base class for MCP connectors"""
+class MCPConnector(Protocol):
+    """Interface that MCP connectors implement"""
     
-    @abstractmethod
     async def connect(self) -> bool:
         """Establish connection to the tool"""
-        pass
+        ...
     
-    @abstractmethod
     async def disconnect(self) -> None:
         """Close connection to the tool"""
-        pass
+        ...
     
-    @abstractmethod
     async def send_message(self, message: MCPMessage) -> MCPMessage:
         """Send a message and receive response"""
-        pass
+        ...
     
-    @abstractmethod
     async def get_capabilities(self) -> Dict:
         """Get tool capabilities"""
-        pass
+        ...
 
 class MCPProtocol:
     """Main MCP protocol handler"""
@@ -168,6 +165,8 @@ class MCPProtocol:
 class MCPCapabilities:
     """Defines capabilities that can be discovered via MCP"""
     
+    __slots__ = ("operations", "data_types", "events", "limits")
+    
     def __init__(self):
         self.operations = []
         self.data_types = []
@@ -212,6 +211,8 @@ class MCPCapabilities:
 class MCPSecurity:
     """Handles security for MCP connections"""
     
+    __slots__ = ("api_keys", "oauth_tokens", "permissions")
+    
     def __init__(self):
         self.api_keys = {}
         self.oauth_tokens = {}
@@ -242,19 +243,23 @@ class MCPSecurity:
         if tool not in self.permissions:
             return True  # Default allow if no permissions set
         
-        tool_perms = self.permissions[tool]
-        
-        if "allow_all" in tool_perms and tool_perms["allow_all"]:
-            return True
-        
-        if "allowed_operations" in tool_perms:
-            return operation in tool_perms["allowed_operations"]
+        mode, operations = self.permissions[tool]
         
-        if "denied_operations" in tool_perms:
-            return operation not in tool_perms["denied_operations"]
+        if mode == "allow_list":
+            return operation in operations
+        if mode == "deny_list":
+            return operation not in operations
         
         return True
     
     def set_permissions(self, tool: str, permissions: Dict) -> None:
         """Set permissions for a tool"""
-        self.permissions[tool] = permissions
\ No newline at end of file
+        # Resolve the permission mode once so check_permission is a single lookup
+        if permissions.get("allow_all"):
+            self.permissions[tool] = ("allow_all", frozenset())
+        elif "allowed_operations" in permissions:
+            self.permissions[tool] = ("allow_list", frozenset(permissions["allowed_operations"]))
+        elif "denied_operations" in permissions:
+            self.permissions[tool] = ("deny_list", frozenset(permissions["denied_operations"]))
+        else:
+            self.permissions[tool] = ("default", frozenset())
\ No newline at end of file
@@ -1,30 +1,321 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Tuple
 import asyncio
+import hashlib
 import logging
+import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from uuid import uuid4
+import orjson
 from app.agents.communication import CommunicationAgent
 from app.agents.database_architect import DatabaseArchitectAgent
 from app.agents.backend_developer import BackendDeveloperAgent
 from app.agents.frontend_developer import FrontendDeveloperAgent
 from app.agents.mcp_integration import MCPIntegrationAgent
-from app.storage import SessionManager
+from app.core.config import settings
+from app.storage import SessionManager, RedisSessionManager, SqliteSessionManager, SessionCache, MessageHistory
 from app.core.onboarding import OnboardingFlow, OnboardingStep, UserProfile
 
 logger = logging.getLogger(__name__)
 
+# Conversation turns sent to the communication agent with each message
+_RECENT_MESSAGE_WINDOW = 10
+
+# Recommended solution per problem area
+_SOLUTION_MAP = MappingProxyType({
+    "support": {
+        "type": "Customer Service Platform",
+        "stack": "FastAPI + React + PostgreSQL",
+        "features": ("Ticket Management", "Auto-Routing", "AI Responses", "Analytics")
+    },
+    "sales": {
+        "type": "Sales Automation System",
+        "stack": "Django + Vue.js + PostgreSQL",
+        "features": ("Lead Tracking", "Pipeline Management", "Email Automation", "Reporting")
+    },
+    "operations": {
+        "type": "Operations Dashboard",
+        "stack": "FastAPI + React + TimescaleDB",
+        "features": ("Real-time Monitoring", "Process Automation", "KPI Tracking", "Alerts")
+    },
+    "data": {
+        "type": "Analytics Platform",
+        "stack": "FastAPI + React + PostgreSQL + Redis",
+        "features": ("Data Pipeline", "Visualization", "Reporting", "ML Insights")
+    },
+    "process": {
+        "type": "Workflow Automation System",
+        "stack": "FastAPI + React + PostgreSQL",
+        "features": ("Process Builder", "Task Management", "Integration Hub", "Monitoring")
+    }
+})
+
+# extracted_info fields (as produced by CommunicationAgent) that gate background
+# planning: at least one field from each group must be filled in
+_PLANNING_FIELD_GROUPS = (
+    frozenset({"surface_problem", "specific_challenge"}),
+    frozenset({"current_process", "current_process_description"}),
+    frozenset({"time_spent", "growth_impact", "quantified_impact"})
+)
+
+# Substring cues in onboarding answers, by category
+_ONBOARDING_CUES = {
+    "confusion": ("help", "what", "huh", "?", "confused", "don't understand", "lost"),
+    "frustration": ("wtf", "fuck", "stupid", "broken", "sucks", "hate", "annoying", "terrible"),
+    "correction": ("not my name", "that's not", "wrong", "no that", "incorrect", "i didn't say")
+}
+
+# All cues compiled into one alternation; match.lastgroup names the category.
+# The lookahead keeps matches zero-width so overlapping cues ("what" / "hate"
+# in "whatever") are all found, as with plain substring checks.
+_ONBOARDING_CUES_RE = re.compile("(?=" + "|".join(
+    f"(?P<{category}>{'|'.join(map(re.escape, cues))})"
+    for category, cues in _ONBOARDING_CUES.items()
+) + ")")
+
+# What each onboarding step asks for, in the user's terms
+_STEP_DESCRIPTIONS = {
+    OnboardingStep.NAME: "your actual name (not 'hey' or a greeting)",
+    OnboardingStep.EMAIL: "your email address",
+    OnboardingStep.BUSINESS_NAME: "the name of your business",
+    OnboardingStep.BUSINESS_TYPE: "what kind of business you run",
+    OnboardingStep.TEAM_SIZE: "how many people work with you",
+    OnboardingStep.MAIN_PROBLEM: "the main operational challenge you're facing"
+}
+
+# Example answer for each onboarding step
+_STEP_EXAMPLES = {
+    OnboardingStep.NAME: "your name is 'John' or 'Sarah', just type that",
+    OnboardingStep.EMAIL: "you'd type something like 'john@company.com'",
+    OnboardingStep.BUSINESS_NAME: "your company is called 'TechCorp', type 'TechCorp'",
+    OnboardingStep.BUSINESS_TYPE: "you run a 'Law Firm' or 'Marketing Agency', just tell me which",
+    OnboardingStep.TEAM_SIZE: "you have 5 people, just type '5' or '5 people'",
+    OnboardingStep.MAIN_PROBLEM: "you're struggling with 'managing client emails' or 'tracking inventory', describe it briefly"
+}
+
+# Consultation phases in which background planning may start
+_PLANNING_PHASES = frozenset({"process_understanding", "impact_analysis", "requirements_gathering"})
+
+# Session fields a background planning run produces
+_PLAN_FIELDS = ("requirements", "integrations", "planned_components", "planned_from", "background_build")
+
+# background_build statuses from which planning may (re)start
+_PLANNABLE_BUILD_STATES = frozenset({"idle", "error", "partial"})
+
+# background_build statuses that end a planning run
+_SETTLED_BUILD_STATES = frozenset({"plan_ready", "partial", "error"})
+
+# First email address in a message, used to look up returning users
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Phrases suggesting a returning user, compiled into one alternation
+_RETURNING_RE = re.compile("|".join(map(re.escape, (
+    "i'm back", "back again", "hello again", "hi again",
+    "remember me", "we talked before", "last time",
+    "continue", "where we left off"
+))), re.IGNORECASE)
+
+# Words that precede a name in messages like "hi again, I'm Sam"
+_NAME_LEAD_WORDS = frozenset({"i'm", "im", "my", "name", "called"})
+
+_WELCOME_BACK_TEMPLATE = """Welcome back, {name}! 
+
+I remember you - you run {business_name}, {business_type}. Last time we were working on {main_problem}.
+
+{initial_message}
+
+Want to continue where we left off, or do you have a new challenge for me to solve?"""
+# Filled in when a stored profile is missing a field
+_WELCOME_BACK_DEFAULTS = {
+    "name": "",
+    "business_name": "",
+    "business_type": "your business",
+    "main_problem": "improving your operations"
+}
+
+# Fields shared by every reply sent while a session is still onboarding
+_ONBOARDING_REPLY = {
+    "phase": "onboarding",
+    "progress": 0,
+    "ready_for_generation": False
+}
+
+# Immutable fields every new session starts with; containers are built per session
+_SESSION_TEMPLATE = {
+    "phase": "onboarding",  # Start with onboarding
+    "ready_for_generation": False,
+    "preview_announced": False,
+    "onboarding_step": OnboardingStep.NAME,
+    "onboarding_complete": False
+}
+
+def _info_signature(info: Dict) -> str:
+    """Stable digest of extracted_info, used to tell whether a plan is still current"""
+    return hashlib.blake2b(
+        orjson.dumps(info, option=orjson.OPT_SORT_KEYS, default=str), digest_size=16
+    ).hexdigest()
+
+def _now_iso() -> str:
+    """Timestamp for background_build transitions"""
+    return datetime.now().isoformat()
+
+def _update_build(session: Dict, **fields: Any) -> None:
+    """Apply a background_build transition as one dict swap, so readers never see it half-done"""
+    session["background_build"] = {
+        **session.get("background_build", {}),
+        **fields,
+        "last_update": _now_iso()
+    }
+
+def _idle_build(last_update: str) -> Dict:
+    """Background planning lifecycle tracking for a session that hasn't planned yet"""
+    return {
+        "status": "idle",           # idle | queued | analyzing | planning_architecture | plan_ready | partial | error
+        "progress": 0,                # 0-100
+        "error": None,
+        "preview_url": None,
+        "last_update": last_update
+    }
+
+def _new_session(session_id: str) -> Dict:
+    """Build a fresh session dict from the template"""
+    now = datetime.now()
+    session = _SESSION_TEMPLATE.copy()
+    session["id"] = session_id
+    session["started_at"] = now
+    session["messages"] = MessageHistory()
+    session["extracted_info"] = {}
+    session["requirements"] = {}
+    session["planned_components"] = {}  # Plans, not generated components
+    session["generated_components"] = {}  # Initialize to prevent crashes
+    session["user_profile"] = {}
+    session["background_build"] = _idle_build(now.isoformat())
+    return session
+
+# Deployment templates
+_DC_BACKEND = """
+  backend:
+    build: ./backend
+    ports:
+      - "8000:8000"
+    environment:
+      - DATABASE_URL=${DATABASE_URL}
+    depends_on:
+      - db
+            """
+
+_DC_FRONTEND = """
+  frontend:
+    build: ./frontend
+    ports:
+      - "3000:3000"
+    environment:
+      - VITE_API_URL=http://backend:8000
+    depends_on:
+      - backend
+            """
+
+_DC_DB = """
+  db:
+    image: postgres:15
+    environment:
+      - POSTGRES_USER=${DB_USER}
+      - POSTGRES_PASSWORD=${DB_PASSWORD}
+      - POSTGRES_DB=${DB_NAME}
+    volumes:
+      - postgres_data:/var/lib/postgresql/data
+        """
+
+_DC_TEMPLATE = """version: '3.8'
+
+services:
+{body}
+
+volumes:
+  postgres_data:
+"""
+
+@lru_cache(maxsize=None)
+def _docker_compose(has_backend: bool, has_frontend: bool) -> str:
+    """Render the compose file; only four distinct outputs exist, so each is built once"""
+    body = (
+        (_DC_BACKEND if has_backend else "")
+        + (_DC_FRONTEND if has_frontend else "")
+        + _DC_DB
+    )
+    return _DC_TEMPLATE.format(body=body)
+
+_CI_GITHUB_ACTIONS = """
+name: CI/CD Pipeline
+
+on:
+  push:
+    branches: [main]
+  pull_request:
+    branches: [main]
+
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v3
+      - name: Run tests
+        run: |
+          docker-compose run backend pytest
+          docker-compose run frontend npm test
+  
+  deploy:
+    needs: test
+    runs-on: ubuntu-latest
+    if: github.ref == 'refs/heads/main'
+    steps:
+      - uses: actions/checkout@v3
+      - name: Deploy
+        run: |
+          echo "Deploy to production"
+"""
+
 class ApplicationGenerationCoordinator:
     def __init__(self):
+        # Caps concurrent generation agent calls so parallel stages can't storm the LLM API
+        self._agent_semaphore = asyncio.Semaphore(settings.AGENT_CONCURRENCY)
         self.agents = self._initialize_agents()
-        self.sessions = {}
-        self.current_session = None
-        self.session_manager = SessionManager()
+        # Direct references for the hot paths; self.agents stays the registry
+        self.comm = self.agents["communication"]
+        self.db_arch = self.agents["database_architect"]
+        self.backend_dev = self.agents["backend_developer"]
+        self.frontend_dev = self.agents["frontend_developer"]
+        self.mcp = self.agents["mcp_integration"]
+        self.sessions = SessionCache(settings.SESSION_CACHE_SIZE)
+        self.session_manager = self._create_session_manager()
         self.onboarding = OnboardingFlow()
+        # Caps concurrent MCP connector setups across all generations
+        self._mcp_semaphore = asyncio.Semaphore(settings.MCP_CONCURRENCY)
+        # In-flight background planning per session; also keeps the tasks referenced
+        self._planning_tasks: Dict[str, asyncio.Task] = {}
+        self._planning_semaphore = asyncio.Semaphore(settings.PLANNING_CONCURRENCY)
+        # Build status subscribers (build_events streams) per session
+        self._build_listeners: Dict[str, Set[asyncio.Queue]] = {}
+        # Write-behind: sessions marked dirty are saved once per flush interval.
+        # Holds the session itself so a cache eviction can't drop a pending write.
+        self._dirty_sessions = {}
+        self._flush_task = None
         
+    def _create_session_manager(self) -> SessionManager:
+        if settings.SESSION_BACKEND == "redis":
+            return RedisSessionManager(settings.REDIS_URL, ttl=settings.SESSION_TTL_SECONDS)
+        if settings.SESSION_BACKEND == "sqlite":
+            return SqliteSessionManager(durable_writes=settings.SESSION_DURABLE_WRITES)
+        return SessionManager(durable_writes=settings.SESSION_DURABLE_WRITES)
+    
     def _initialize_agents(self) -> Dict[str, Any]:
         return {
             "communication": CommunicationAgent(),
             "database_architect": DatabaseArchitectAgent(),
-            "backend_developer": BackendDeveloperAgent(),
+            # Takes a slot of the shared cap per LLM call, one for each generated file
+            "backend_developer": BackendDeveloperAgent(limiter=self._agent_semaphore),
             "frontend_developer": FrontendDeveloperAgent(),
             "mcp_integration": MCPIntegrationAgent()
         }
@@ -33,59 +324,37 @@ class ApplicationGenerationCoordinator:
         """Start a new consultation session"""
         
         # Initialize session with onboarding-first structure
-        self.current_session = {
-            "id": session_id,
-            "started_at": datetime.now(),
-            "phase": "onboarding",  # Start with onboarding
-            "messages": [],
-            "extracted_info": {},
-            "requirements": {},
-            "planned_components": {},  # Plans, not generated components
-            "generated_components": {},  # Initialize to prevent crashes
-            "ready_for_generation": False,
-            "preview_announced": False,
-            # User profile and onboarding
-            "user_profile": {},
-            "onboarding_step": OnboardingStep.NAME,
-            "onboarding_complete": False,
-            # Background planning lifecycle tracking  
-            "background_build": {
-                "status": "idle",           # idle | planning | analyzing | planning_architecture | plan_ready | error
-                "progress": 0,                # 0-100
-                "error": None,
-                "preview_url": None,
-                "last_update": datetime.now().isoformat()
-            }
-        }
+        session = _new_session(session_id)
         
-        self.sessions[session_id] = self.current_session
+        self.sessions[session_id] = session
         
-        # Start with onboarding instead of jumping into consultation
-        if initial_message.strip():
-            # Check if this might be a returning user
-            existing_user = self._try_recognize_returning_user(initial_message)
-            if existing_user:
-                return await self._handle_returning_user(session_id, existing_user, initial_message)
+        try:
+            # Start with onboarding instead of jumping into consultation
+            if initial_message.strip():
+                # Check if this might be a returning user
+                existing_user = await self._try_recognize_returning_user(initial_message)
+                if existing_user:
+                    return await self._handle_returning_user(session_id, existing_user, initial_message)
+                else:
+                    # New user - start onboarding
+                    return await self.process_onboarding_message(session_id, initial_message)
             else:
-                # New user - start onboarding
-                return await self.process_onboarding_message(session_id, initial_message)
-        else:
-            # No initial message - start onboarding
-            welcome_msg = self.onboarding.get_welcome_message()
-            session = self.current_session
-            session["messages"].append({
-                "role": "assistant", 
-                "content": welcome_msg
-            })
-            
-            return {
-                "session_id": session_id,
-                "response": welcome_msg,
-                "phase": "onboarding",
-                "progress": 0,
-                "onboarding_step": OnboardingStep.NAME.value,
-                "ready_for_generation": False
-            }
+                # No initial message - start onboarding
+                welcome_msg = self.onboarding.get_welcome_message()
+                session["messages"].append({
+                    "role": "assistant", 
+                    "content": welcome_msg
+                })
+                self._mark_dirty(session_id)
+                
+                return {
+                    **_ONBOARDING_REPLY,
+                    "session_id": session_id,
+                    "response": welcome_msg,
+                    "onboarding_step": OnboardingStep.NAME.value
+                }
+        finally:
+            await self._write_through()
     
     async def process_onboarding_message(self, session_id: str, message: str) -> Dict:
         """Process onboarding messages to capture user profile"""
@@ -93,25 +362,23 @@ class ApplicationGenerationCoordinator:
         if not session:
             raise ValueError(f"Session {session_id} not found")
         
-        # Add user message to history
-        session["messages"].append({
+        # User turn is recorded together with the reply below
+        user_turn = {
             "role": "user",
             "content": message
-        })
+        }
         
         # Process the onboarding step
         current_step = session.get("onboarding_step", OnboardingStep.NAME)
         profile = session.get("user_profile", {})
         
         # Special case: if they're asking for help or seem confused during onboarding  
-        confusion_indicators = ["help", "what", "huh", "?", "confused", "don't understand", "lost"]
-        frustration_indicators = ["wtf", "fuck", "stupid", "broken", "sucks", "hate", "annoying", "terrible"]
-        correction_indicators = ["not my name", "that's not", "wrong", "no that", "incorrect", "i didn't say"]
-        
         message_lower = message.lower().strip()
+        # One regex pass finds every cue category present in the message
+        cues = {match.lastgroup for match in _ONBOARDING_CUES_RE.finditer(message_lower)}
         
         # Check for frustration first
-        if any(word in message_lower for word in frustration_indicators):
+        if "frustration" in cues:
             help_msg = f"""I understand this might be frustrating. Let me clarify - I need a few basic details to build custom software specifically for YOUR business.
 
 Currently, I need: {self._get_friendly_step_description(current_step)}
@@ -119,7 +386,7 @@ Currently, I need: {self._get_friendly_step_description(current_step)}
 For example, if {self._get_step_example(current_step)}"""
             
         # Check for correction (user saying that wasn't their name/info)
-        elif any(phrase in message_lower for phrase in correction_indicators):
+        elif "correction" in cues:
             # If they're correcting, we need to go back to the appropriate step
             if current_step == OnboardingStep.EMAIL and profile.get("name"):
                 # They're saying the name was wrong, go back to name step
@@ -130,7 +397,7 @@ For example, if {self._get_step_example(current_step)}"""
                 help_msg = f"Let me correct that. {self.onboarding.get_current_question(current_step, profile)}"
         
         # Check for confusion
-        elif any(word in message_lower for word in confusion_indicators):
+        elif "confusion" in cues:
             help_msg = f"""No problem! I'm MIOSA - I build custom business software. To create something perfect for you, I need to understand your business first.
 
 Right now I need: {self._get_friendly_step_description(current_step)}
@@ -142,18 +409,17 @@ Right now I need: {self._get_friendly_step_description(current_step)}
             
         # If we generated a help message, return it
         if help_msg:
-            session["messages"].append({
+            session["messages"].extend((user_turn, {
                 "role": "assistant",
                 "content": help_msg
-            })
+            }))
+            self._mark_dirty(session_id)
             
             return {
+                **_ONBOARDING_REPLY,
                 "session_id": session_id,
                 "response": help_msg,
-                "phase": "onboarding",
-                "progress": 0,
-                "onboarding_step": current_step.value,
-                "ready_for_generation": False
+                "onboarding_step": current_step.value
             }
         
         # Process the onboarding answer
@@ -194,14 +460,14 @@ Right now I need: {self._get_friendly_step_description(current_step)}
             # Set initial progress from onboarding (not 0)
             session["last_progress"] = 25  # Onboarding gives us 25% baseline
         
-        # Add response to history
-        session["messages"].append({
+        # Add both turns to history
+        session["messages"].extend((user_turn, {
             "role": "assistant",
             "content": response_msg
-        })
+        }))
         
         # Save session
-        self.session_manager.save_session(session_id, session)
+        self._mark_dirty(session_id)
         
         return {
             "session_id": session_id,
@@ -232,12 +498,10 @@ Right now I need: {self._get_friendly_step_description(current_step)}
                 welcome = self.onboarding.get_welcome_message()
                 # Do not add an assistant message here; let CLI render
                 return {
+                    **_ONBOARDING_REPLY,
                     "session_id": session_id,
                     "response": welcome,
-                    "phase": "onboarding",
-                    "progress": 0,
-                    "progress_details": {},
-                    "ready_for_generation": False,
+                    "progress_details": {}
                 }
             
             next_step, reply_text, valid = self.onboarding.process_answer(current_step, message, profile)
@@ -249,23 +513,26 @@ Right now I need: {self._get_friendly_step_description(current_step)}
             session["phase"] = "onboarding"
             
             # Record conversation turns
-            session["messages"].append({"role": "user", "content": message})
-            session["messages"].append({"role": "assistant", "content": reply_text})
+            session["messages"].extend((
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": reply_text}
+            ))
             
             # Save and return immediately during onboarding
-            self.session_manager.save_session(session_id, session)
+            self._mark_dirty(session_id)
             return {
+                **_ONBOARDING_REPLY,
                 "session_id": session_id,
                 "response": reply_text,
-                "phase": "onboarding",
-                "progress": 0,
                 "progress_details": {},
-                "ready_for_generation": False,
                 "background_build": session.get("background_build"),
                 "plan_ready": False,
                 "preview_announced": session.get("preview_announced", False)
             }
         
+        # Imported or legacy sessions may predate build tracking
+        session.setdefault("background_build", _idle_build(_now_iso()))
+        
         # Add message to history
         session["messages"].append({
             "role": "user",
@@ -273,58 +540,54 @@ Right now I need: {self._get_friendly_step_description(current_step)}
         })
         
         # Process through communication agent
-        result = await self.agents["communication"].process_task({
+        result = await self.comm.process_task({
             "type": "understand_request",
             "message": message,
-            "session_data": session
+            "session_data": self._communication_view(session)
         })
         
-        # Update session with new info
-        session["phase"] = result["phase"]
+        # Update session with new info, writing each field once
+        ready_for_generation = bool(result.get("ready_for_generation") or result.get("should_build"))
+        if ready_for_generation:
+            logger.info(f"Session {session_id} ready for generation")
+        
+        # If they explicitly want to build now, set the phase
+        session["phase"] = "building" if result.get("should_build") else result["phase"]
         session["extracted_info"] = result["extracted_info"]
         session["last_progress"] = result.get("last_progress", 0)  # Store for progress smoothing
         session["messages"].append({
             "role": "assistant",
             "content": result["response"]
         })
-        session["ready_for_generation"] = result.get("ready_for_generation", False)
-        
-        # CRITICAL: If user has provided enough info, mark ready for generation
-        if result.get("ready_for_generation") or result.get("should_build"):
-            logger.info(f"Session {session_id} ready for generation")
-            session["ready_for_generation"] = True
-            
-            # If they explicitly want to build now, set the phase
-            if result.get("should_build"):
-                session["phase"] = "building"
-        
-        # Save session to persistent storage
-        self.session_manager.save_session(session_id, session)
+        session["ready_for_generation"] = ready_for_generation
         
         # Only trigger background planning (not building) when we have enough info
         try:
-            if result["phase"] in ("process_understanding", "impact_analysis", "requirements_gathering") and \
-               self._has_enough_info_to_plan(session.get("extracted_info", {})) and \
-               session.get("background_build", {}).get("status") in ("idle", "error"):
+            if result["phase"] in _PLANNING_PHASES and \
+               session["background_build"]["status"] in _PLANNABLE_BUILD_STATES and \
+               self._has_enough_info_to_plan(session.get("extracted_info", {})):
                 await self._trigger_background_planning(session_id, session["extracted_info"])
         except Exception as e:
             # Don't break the consultation on background failures
-            session["background_build"]["status"] = "error"
-            session["background_build"]["error"] = str(e)
-            session["background_build"]["last_update"] = datetime.now().isoformat()
-            self.session_manager.save_session(session_id, session)
+            _update_build(session, status="error", error=str(e))
+            self._publish_build_status(session_id)
         
         # When ready, automatically suggest solution
         if result["phase"] == "recommendation":
-            solution = await self._generate_solution_recommendation(result["extracted_info"])
+            solution = self._generate_solution_recommendation(result["extracted_info"])
             result["solution"] = solution
         
+        # Bound after any trigger above, since transitions swap in a new dict
+        build = session["background_build"]
+        
         # Determine plan readiness and set announcement flag once
-        plan_ready = session.get("background_build", {}).get("status") == "plan_ready"
+        plan_ready = build["status"] == "plan_ready"
         if plan_ready and not session.get("preview_announced"):
             session["preview_announced"] = True
-            self.session_manager.save_session(session_id, session)
-
+        
+        # One write-behind save covers every change made for this message
+        self._mark_dirty(session_id)
+        
         return {
             "session_id": session_id,
             "response": result["response"],
@@ -335,11 +598,74 @@ Right now I need: {self._get_friendly_step_description(current_step)}
             "solution": result.get("solution"),
             "comprehensive_detected": result.get("comprehensive_detected", False),
             "should_build": result.get("should_build", False),
-            "background_build": session.get("background_build"),
+            "background_build": build,
             "plan_ready": plan_ready,
             "preview_announced": session.get("preview_announced", False)
         }
     
+    def _communication_view(self, session: Dict) -> Dict:
+        """The slice of a session the communication agent reads, with recent history only"""
+        return {
+            # Walk the deque from the end so only the window is copied, not the full history
+            "messages": list(islice(reversed(session["messages"]), _RECENT_MESSAGE_WINDOW))[::-1],
+            "extracted_info": session.get("extracted_info", {}),
+            "business_profile": session.get("business_profile", {}),
+            "user_profile": session.get("user_profile", {}),
+            "last_progress": session.get("last_progress", 0),
+            "onboarding_complete": session.get("onboarding_complete", False),
+            # The agent's truthfulness guard reads the background planning status under this name
+            "build_status": session.get("background_build", {}).get("status", "idle"),
+            "ready_for_generation": session.get("ready_for_generation", False)
+        }
+    
+    def _mark_dirty(self, session_id: str, session: Optional[Dict] = None) -> None:
+        """Queue a session for the next write-behind flush.
+        
+        Callers holding a session that may have been evicted from the cache pass it in.
+        """
+        session = session or self.sessions.get(session_id) or self._dirty_sessions.get(session_id)
+        if not session:
+            return
+        self._dirty_sessions[session_id] = session
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+    
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(settings.SESSION_FLUSH_INTERVAL)
+        await self.flush_sessions()
+    
+    async def shutdown(self) -> None:
+        """Cancel in-flight background planning and persist pending session writes"""
+        tasks = dict(self._planning_tasks)
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        
+        # Interrupted plans go back to idle so the next message triggers them again
+        for session_id in tasks:
+            session = self.sessions.get(session_id) or self._dirty_sessions.get(session_id)
+            if session and session["background_build"].get("status") != "plan_ready":
+                _update_build(session, status="idle")
+                self._mark_dirty(session_id, session)
+        
+        await self.flush_sessions()
+        await self.session_manager.shutdown()
+    
+    async def flush_sessions(self) -> None:
+        """Persist every session with pending writes, including ones marked while flushing"""
+        while self._dirty_sessions:
+            dirty, self._dirty_sessions = self._dirty_sessions, {}
+            failed = {}
+            for session_id, session in dirty.items():
+                if session and not await self.session_manager.save_session(session_id, session):
+                    failed[session_id] = session
+            if failed:
+                # Kept for a retry after the flush interval; a newer mark keeps its own copy
+                for session_id, session in failed.items():
+                    self._dirty_sessions.setdefault(session_id, session)
+                self._flush_task = asyncio.create_task(self._flush_after_interval())
+                return
+    
     async def continue_consultation(
         self, 
         session_id: str, 
@@ -347,137 +673,165 @@ Right now I need: {self._get_friendly_step_description(current_step)}
     ) -> Dict:
         """Continue an existing consultation - handles both onboarding and consultation phases"""
         
-        session = self.sessions.get(session_id)
+        # Memory, then pending writes, then storage
+        session = await self.get_session(session_id)
         if not session:
-            # Load from storage if not in memory
-            session = self.session_manager.load_session(session_id)
-            if session:
-                self.sessions[session_id] = session
-            else:
-                raise ValueError(f"Session {session_id} not found")
+            raise ValueError(f"Session {session_id} not found")
         
         # Check what phase we're in
-        if not session.get("onboarding_complete", False):
-            # Still in onboarding
-            return await self.process_onboarding_message(session_id, message)
-        else:
-            # In consultation phase
-            return await self.process_consultation_message(session_id, message)
+        try:
+            if not session.get("onboarding_complete", False):
+                # Still in onboarding
+                return await self.process_onboarding_message(session_id, message)
+            else:
+                # In consultation phase
+                return await self.process_consultation_message(session_id, message)
+        finally:
+            await self._write_through()
+    
+    async def _write_through(self) -> None:
+        """With shared storage the next turn may land on another worker, so this turn's writes go out now"""
+        if self.session_manager.SHARED_SESSIONS:
+            await self.flush_sessions()
     
-    async def _generate_solution_recommendation(self, extracted_info: Dict) -> Dict:
+    def _generate_solution_recommendation(self, extracted_info: Dict) -> Dict:
         """Generate a solution recommendation based on extracted info"""
         
         problem_area = extracted_info.get("problem_area", "process")
         business_impact = extracted_info.get("business_impact_level", "medium")
         
         # Determine the best technical approach
-        solution_map = {
-            "support": {
-                "type": "Customer Service Platform",
-                "stack": "FastAPI + React + PostgreSQL",
-                "features": ["Ticket Management", "Auto-Routing", "AI Responses", "Analytics"]
-            },
-            "sales": {
-                "type": "Sales Automation System",
-                "stack": "Django + Vue.js + PostgreSQL",
-                "features": ["Lead Tracking", "Pipeline Management", "Email Automation", "Reporting"]
-            },
-            "operations": {
-                "type": "Operations Dashboard",
-                "stack": "FastAPI + React + TimescaleDB",
-                "features": ["Real-time Monitoring", "Process Automation", "KPI Tracking", "Alerts"]
-            },
-            "data": {
-                "type": "Analytics Platform",
-                "stack": "FastAPI + React + PostgreSQL + Redis",
-                "features": ["Data Pipeline", "Visualization", "Reporting", "ML Insights"]
-            },
-            "process": {
-                "type": "Workflow Automation System",
-                "stack": "FastAPI + React + PostgreSQL",
-                "features": ["Process Builder", "Task Management", "Integration Hub", "Monitoring"]
-            }
-        }
-        
-        solution = solution_map.get(problem_area, solution_map["process"])
+        solution = _SOLUTION_MAP.get(problem_area, _SOLUTION_MAP["process"])
         
         return {
             "recommended_solution": solution["type"],
             "technical_stack": solution["stack"],
-            "core_features": solution["features"],
+            "core_features": list(solution["features"]),
             "estimated_impact": f"Will reduce {extracted_info.get('time_spent', 'significant time')} spent on {extracted_info.get('surface_problem', 'this problem')}",
             "next_steps": "Ready to generate your custom application"
         }
     
     async def generate_application(self, session_id: str) -> Dict:
-        session = self.sessions.get(session_id)
+        """Run the full generation pipeline and return the final result"""
+        async for event in self.generate_application_stream(session_id):
+            if event["stage"] == "error":
+                return {
+                    "status": "error",
+                    "error": event["error"]
+                }
+            if event["stage"] == "complete":
+                return {
+                    "status": "success",
+                    "project_id": event["result"]["project_id"],
+                    "components": event["result"]["components"],
+                    "summary": event["result"]["summary"]
+                }
+        return {"status": "error", "error": "Generation ended without completing"}
+    
+    async def generate_application_stream(self, session_id: str) -> AsyncIterator[Dict]:
+        """Run the generation pipeline, yielding an event as each stage completes.
+        
+        Each stage's output is saved before its event is yielded, so work finished
+        before a failure is kept. Only the generation results are written, so a
+        worker never overwrites messages the API saved meanwhile.
+        """
+        session = await self.get_session(session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
         
         if not session.get("ready_for_generation"):
             raise ValueError("Consultation not complete")
         
+        components = session["generated_components"]
+        
         try:
-            requirements = await self._extract_requirements(session)
-            session["requirements"] = requirements
-            
-            integrations = await self._identify_integrations(session)
-            session["integrations"] = integrations
-            
-            database = await self._design_database(requirements)
-            session["generated_components"]["database"] = database
-            
-            backend = await self._generate_backend(
-                database, 
-                requirements, 
-                integrations
-            )
-            session["generated_components"]["backend"] = backend
+            planned = self._planned_requirements(session)
+            if planned:
+                requirements, integrations = planned
+            else:
+                requirements, integrations = await self._extract_requirements_and_integrations(session)
+                session["requirements"] = requirements
+                session["integrations"] = integrations
+                await self.session_manager.save_generation_results(session_id, session)
+            yield {"stage": "requirements", "result": {"requirements": requirements, "integrations": integrations}}
             
-            mcp_connectors = await self._setup_mcp_integrations(integrations)
-            session["generated_components"]["mcp_connectors"] = mcp_connectors
+            # Connectors depend only on integrations, so they are set up while the
+            # database and backend (which needs integrations, not connectors) are generated
+            mcp_task = asyncio.create_task(self._setup_mcp_integrations(integrations))
+            try:
+                database = await self._design_database(requirements)
+                components["database"] = database
+                await self.session_manager.save_generation_results(session_id, session)
+                yield {"stage": "database", "result": database}
+                
+                backend = await self._generate_backend(
+                    database, 
+                    requirements, 
+                    integrations
+                )
+                components["backend"] = backend
+                await self.session_manager.save_generation_results(session_id, session)
+                yield {"stage": "backend", "result": backend}
+                
+                mcp_connectors = await mcp_task
+            finally:
+                mcp_task.cancel()
+            components["mcp_connectors"] = mcp_connectors
+            await self.session_manager.save_generation_results(session_id, session)
+            yield {"stage": "mcp_connectors", "result": mcp_connectors}
             
             frontend = await self._generate_frontend(
                 backend, 
                 requirements,
                 session.get("extracted_info", {}).get("design_preferences", {})
             )
-            session["generated_components"]["frontend"] = frontend
+            components["frontend"] = frontend
+            await self.session_manager.save_generation_results(session_id, session)
+            yield {"stage": "frontend", "result": frontend}
             
-            deployment = await self._prepare_deployment(session)
-            session["generated_components"]["deployment"] = deployment
+            deployment = self._prepare_deployment(session)
+            components["deployment"] = deployment
+            await self.session_manager.save_generation_results(session_id, session)
+            yield {"stage": "deployment", "result": deployment}
             
-            project_id = await self._create_project(session)
+            project_id = self._create_project(session)
             
-            return {
-                "status": "success",
-                "project_id": project_id,
-                "components": session["generated_components"],
-                "summary": await self._generate_summary(session)
+            yield {
+                "stage": "complete",
+                "result": {
+                    "project_id": project_id,
+                    "components": components,
+                    "summary": self._generate_summary(session)
+                }
             }
             
         except Exception as e:
             logger.error(f"Error generating application: {e}")
-            return {
-                "status": "error",
-                "error": str(e)
-            }
+            yield {"stage": "error", "error": str(e)}
+    
+    async def _run_agent(self, agent: Any, task: Dict) -> Dict:
+        """Run a generation agent task under the shared concurrency cap"""
+        async with self._agent_semaphore:
+            return await agent.process_task(task)
     
-    async def _extract_requirements(self, session: Dict) -> Dict:
-        return await self.agents["communication"].process_task({
-            "type": "extract_requirements",
+    async def _extract_requirements_and_integrations(self, session: Dict) -> Tuple[Dict, List[Dict]]:
+        """One communication agent round trip for both requirements and integrations"""
+        result = await self._run_agent(self.comm, {
+            "type": "extract_requirements_and_integrations",
             "consultation": session.get("extracted_info", {})
         })
+        return result["requirements"], result["integrations"]
     
-    async def _identify_integrations(self, session: Dict) -> List[Dict]:
-        result = await self.agents["communication"].process_task({
-            "type": "identify_integrations",
-            "context": session.get("extracted_info", {})
-        })
-        return result.get("integrations", [])
+    def _planned_requirements(self, session: Dict) -> Optional[Tuple[Dict, List[Dict]]]:
+        """Requirements and integrations from background planning, if still current"""
+        if session.get("background_build", {}).get("status") != "plan_ready":
+            return None
+        if session.get("planned_from") != _info_signature(session.get("extracted_info", {})):
+            return None
+        return session["requirements"], session.get("integrations", [])
     
     async def _design_database(self, requirements: Dict) -> Dict:
-        return await self.agents["database_architect"].process_task({
+        return await self._run_agent(self.db_arch, {
             "type": "design_schema",
             "requirements": requirements
         })
@@ -488,7 +842,9 @@ Right now I need: {self._get_friendly_step_description(current_step)}
         requirements: Dict, 
         integrations: List[Dict]
     ) -> Dict:
-        return await self.agents["backend_developer"].process_task({
+        # Not through _run_agent: the agent limits its own calls, and holding a slot
+        # here while its file calls wait for more could exhaust the cap
+        return await self.backend_dev.process_task({
             "type": "generate_backend",
             "database_schema": database,
             "requirements": requirements,
@@ -497,15 +853,31 @@ Right now I need: {self._get_friendly_step_description(current_step)}
         })
     
     async def _setup_mcp_integrations(self, integrations: List[Dict]) -> List[Dict]:
-        connectors = []
+        async def _setup_one(integration: Dict) -> Dict:
+            async with self._mcp_semaphore:
+                return await self.mcp.process_task({
+                    "type": "integrate_tool",
+                    "tool_type": integration.get("type"),
+                    "requirements": integration
+                })
         
-        for integration in integrations:
-            connector = await self.agents["mcp_integration"].process_task({
-                "type": "integrate_tool",
-                "tool_type": integration.get("type"),
-                "requirements": integration
-            })
-            connectors.append(connector)
+        results = await asyncio.gather(
+            *[_setup_one(integration) for integration in integrations],
+            return_exceptions=True
+        )
+        
+        # One failed integration is reported on its connector instead of aborting the batch
+        connectors = []
+        for integration, result in zip(integrations, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error setting up {integration.get('type')} integration: {result}")
+                connectors.append({
+                    "tool_type": integration.get("type"),
+                    "status": "error",
+                    "error": str(result)
+                })
+            else:
+                connectors.append(result)
         
         return connectors
     
@@ -515,7 +887,7 @@ Right now I need: {self._get_friendly_step_description(current_step)}
         requirements: Dict,
         design_preferences: Dict
     ) -> Dict:
-        return await self.agents["frontend_developer"].process_task({
+        return await self._run_agent(self.frontend_dev, {
             "type": "generate_frontend",
             "backend_api": backend,
             "requirements": requirements,
@@ -525,84 +897,123 @@ Right now I need: {self._get_friendly_step_description(current_step)}
 
     def _has_enough_info_to_plan(self, info: Dict) -> bool:
         """Heuristics to start background planning around layer2."""
-        if not info:
-            return False
-        # Common fields extracted by CommunicationAgent
-        has_problem = bool(info.get("surface_problem") or info.get("specific_challenge"))
-        has_process = bool(info.get("current_process") or info.get("current_process_description"))
-        # Optional: some impact/time signal helps
-        has_impact = bool(info.get("time_spent") or info.get("growth_impact") or info.get("quantified_impact"))
-        return has_problem and has_process and has_impact
+        # Needs a problem, the current process, and some impact/time signal;
+        # only the gating fields are looked at, stopping at the first empty group
+        return bool(info) and all(
+            any(info.get(field) for field in fields) for fields in _PLANNING_FIELD_GROUPS
+        )
 
     async def _trigger_background_planning(self, session_id: str, info: Dict) -> None:
         """Mark session and spawn a non-blocking background planning task."""
         session = self.sessions.get(session_id)
-        if not session:
+        if not session or session_id in self._planning_tasks:
             return
-        session["background_build"]["status"] = "planning"
-        session["background_build"]["progress"] = 5
-        session["background_build"]["error"] = None
-        session["background_build"]["last_update"] = datetime.now().isoformat()
-        self.session_manager.save_session(session_id, session)
+        # Queued until a planning slot (PLANNING_CONCURRENCY) frees up
+        _update_build(session, status="queued", progress=0, error=None)
+        await self._save_build_status(session_id, session)
 
-        # Fire-and-forget background task for planning only
-        asyncio.create_task(self._run_background_planning(session_id))
+        # Background task for planning only; a second trigger while it runs is a no-op
+        task = asyncio.create_task(self._run_background_planning(session_id))
+        self._planning_tasks[session_id] = task
+        task.add_done_callback(lambda _: self._planning_tasks.pop(session_id, None))
 
     async def _run_background_planning(self, session_id: str) -> None:
         """Progressively plan solution architecture without blocking the consultation."""
-        session = self.sessions.get(session_id)
-        if not session:
-            return
-        try:
-            session["background_build"]["status"] = "analyzing"
-            session["background_build"]["progress"] = 15
-            session["background_build"]["last_update"] = datetime.now().isoformat()
-            self.session_manager.save_session(session_id, session)
-
-            # Derive minimal requirements from extracted_info (planning only)
-            requirements = await self._extract_requirements(session)
-            session["requirements"] = requirements
-            session["background_build"]["progress"] = 30
-            session["background_build"]["status"] = "planning_architecture"
-            self.session_manager.save_session(session_id, session)
-
-            # Identify integrations needed
-            integrations = await self._identify_integrations(session)
-            session["integrations"] = integrations
-            session["background_build"]["progress"] = 50
-            self.session_manager.save_session(session_id, session)
-
-            # Plan database structure (no actual generation)
-            database_plan = await self._plan_database(requirements)
-            session["planned_components"]["database"] = database_plan
-            session["background_build"]["progress"] = 70
-            self.session_manager.save_session(session_id, session)
-
-            # Plan backend architecture (no code generation)
-            backend_plan = await self._plan_backend(requirements, integrations)
-            session["planned_components"]["backend"] = backend_plan
-            session["background_build"]["progress"] = 85
-            self.session_manager.save_session(session_id, session)
-
-            # Plan frontend approach
-            frontend_plan = await self._plan_frontend(requirements)
-            session["planned_components"]["frontend"] = frontend_plan
-            session["background_build"]["progress"] = 100
-            session["background_build"]["status"] = "plan_ready"
-            session["background_build"]["last_update"] = datetime.now().isoformat()
-
-            # No preview URL - this is just planning
-            session["background_build"]["preview_url"] = None
+        async with self._planning_semaphore:
+            session = self.sessions.get(session_id)
+            if not session:
+                return
+            try:
+                _update_build(session, status="analyzing", progress=15)
+                await self._save_build_status(session_id, session)
+
+                # Derive requirements and integrations with the same call generation uses,
+                # so generation can reuse them while extracted_info is unchanged
+                planned_from = _info_signature(session.get("extracted_info", {}))
+                timed_out_stage = None
+                try:
+                    async with asyncio.timeout(settings.PLANNING_STAGE_TIMEOUT):
+                        requirements, integrations = await self._extract_requirements_and_integrations(session)
+                except TimeoutError:
+                    # Plan the rest anyway; the plan is marked partial and generation re-extracts
+                    logger.warning(f"Requirements extraction timed out for session {session_id}")
+                    timed_out_stage = "requirements"
+                    requirements, integrations = {}, []
+                session["requirements"] = requirements
+                session["integrations"] = integrations
+                _update_build(session, status="planning_architecture", progress=50)
+                # Progress ticks persist only the build status; the full session is saved once at the end
+                await self._save_build_status(session_id, session)
+
+                # Plan steps are synchronous, so intermediate progress is never observable
+                # Plan database structure (no actual generation)
+                database_plan = self._plan_database(requirements)
+                session["planned_components"]["database"] = database_plan
+
+                # Plan backend architecture (no code generation)
+                backend_plan = self._plan_backend(requirements, integrations)
+                session["planned_components"]["backend"] = backend_plan
+
+                # Plan frontend approach
+                frontend_plan = self._plan_frontend(requirements)
+                session["planned_components"]["frontend"] = frontend_plan
+                # No preview URL - this is just planning
+                _update_build(
+                    session,
+                    status="partial" if timed_out_stage else "plan_ready",
+                    progress=100,
+                    timed_out_stage=timed_out_stage,
+                    preview_url=None
+                )
+                if not timed_out_stage:
+                    session["planned_from"] = planned_from
             
-            self.session_manager.save_session(session_id, session)
-        except Exception as e:
-            session = self.sessions.get(session_id) or {}
-            if session:
-                session.setdefault("background_build", {})
-                session["background_build"]["status"] = "error"
-                session["background_build"]["error"] = str(e)
-                session["background_build"]["last_update"] = datetime.now().isoformat()
-                self.session_manager.save_session(session_id, session)
+                if self.session_manager.SHARED_SESSIONS:
+                    # Turns taken on other workers meanwhile replaced the cached copy; carry the plan over
+                    current = await self.get_session(session_id)
+                    if current is not None and current is not session:
+                        current.update({field: session[field] for field in _PLAN_FIELDS if field in session})
+                        session = current
+                
+                self._publish_build_status(session_id)
+                # Plans, requirements and final status land in the next write-behind flush;
+                # the session is passed in since it may have left the cache while planning ran
+                self._mark_dirty(session_id, session)
+            except Exception as e:
+                session = self.sessions.get(session_id) or {}
+                if session:
+                    _update_build(session, status="error", error=str(e))
+                    await self._save_build_status(session_id, session)
+
+    async def _save_build_status(self, session_id: str, session: Dict) -> None:
+        """Push a background_build change to subscribers, then persist it"""
+        self._publish_build_status(session_id)
+        await self.session_manager.save_build_status(session_id, session)
+
+    def _publish_build_status(self, session_id: str) -> None:
+        listeners = self._build_listeners.get(session_id)
+        if listeners:
+            status = self.get_build_status(session_id)
+            for queue in listeners:
+                queue.put_nowait(status)
+
+    async def build_events(self, session_id: str) -> AsyncIterator[Dict]:
+        """Yield the build status now and on every change until planning settles"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._build_listeners.setdefault(session_id, set()).add(queue)
+        try:
+            status = self.get_build_status(session_id)
+            while True:
+                yield status
+                if status["background_build"].get("status") in _SETTLED_BUILD_STATES:
+                    return
+                status = await queue.get()
+        finally:
+            listeners = self._build_listeners.get(session_id)
+            if listeners is not None:
+                listeners.discard(queue)
+                if not listeners:
+                    del self._build_listeners[session_id]
 
     def get_build_status(self, session_id: str) -> Dict:
         """Lightweight accessor for background planning status for use by API layer or UI polling."""
@@ -611,12 +1022,13 @@ Right now I need: {self._get_friendly_step_description(current_step)}
             raise ValueError(f"Session {session_id} not found")
         return {
             "session_id": session_id,
-            "background_build": session.get("background_build", {}),
+            # Snapshot, since the live dict keeps changing while events are queued
+            "background_build": dict(session.get("background_build", {})),
             "plan_ready": session.get("background_build", {}).get("status") == "plan_ready",
             "preview_announced": session.get("preview_announced", False)
         }
     
-    async def _plan_database(self, requirements: Dict) -> Dict:
+    def _plan_database(self, requirements: Dict) -> Dict:
         """Plan database structure without generating actual schema"""
         return {
             "planned_tables": ["users", "projects", "tasks"],
@@ -624,7 +1036,7 @@ Right now I need: {self._get_friendly_step_description(current_step)}
             "approach": "Relational database with normalized structure"
         }
     
-    async def _plan_backend(self, requirements: Dict, integrations: List) -> Dict:
+    def _plan_backend(self, requirements: Dict, integrations: List) -> Dict:
         """Plan backend architecture without generating code"""
         return {
             "framework": "FastAPI",
@@ -633,7 +1045,7 @@ Right now I need: {self._get_friendly_step_description(current_step)}
             "integrations_needed": len(integrations)
         }
     
-    async def _plan_frontend(self, requirements: Dict) -> Dict:
+    def _plan_frontend(self, requirements: Dict) -> Dict:
         """Plan frontend approach without generating components"""
         return {
             "framework": "React",
@@ -642,100 +1054,26 @@ Right now I need: {self._get_friendly_step_description(current_step)}
             "ui_library": "Material-UI"
         }
     
-    async def _prepare_deployment(self, session: Dict) -> Dict:
+    def _prepare_deployment(self, session: Dict) -> Dict:
         components = session["generated_components"]
         
         return {
-            "docker_compose": await self._generate_docker_compose(components),
-            "kubernetes": await self._generate_kubernetes_manifests(components),
-            "ci_cd": await self._generate_ci_cd_pipeline(components),
-            "environment_vars": await self._extract_env_vars(components)
+            "docker_compose": self._generate_docker_compose(components),
+            "kubernetes": self._generate_kubernetes_manifests(components),
+            "ci_cd": self._generate_ci_cd_pipeline(components),
+            "environment_vars": self._extract_env_vars(components)
         }
     
-    async def _generate_docker_compose(self, components: Dict) -> str:
-        services = []
-        
-        if "backend" in components:
-            services.append("""
-  backend:
-    build: ./backend
-    ports:
-      - "8000:8000"
-    environment:
-      - DATABASE_URL=${DATABASE_URL}
-    depends_on:
-      - db
-            """)
-        
-        if "frontend" in components:
-            services.append("""
-  frontend:
-    build: ./frontend
-    ports:
-      - "3000:3000"
-    environment:
-      - VITE_API_URL=http://backend:8000
-    depends_on:
-      - backend
-            """)
-        
-        services.append("""
-  db:
-    image: postgres:15
-    environment:
-      - POSTGRES_USER=${DB_USER}
-      - POSTGRES_PASSWORD=${DB_PASSWORD}
-      - POSTGRES_DB=${DB_NAME}
-    volumes:
-      - postgres_data:/var/lib/postgresql/data
-        """)
-        
-        return f"""version: '3.8'
-
-services:
-{''.join(services)}
-
-volumes:
-  postgres_data:
-"""
+    def _generate_docker_compose(self, components: Dict) -> str:
+        return _docker_compose("backend" in components, "frontend" in components)
     
-    async def _generate_kubernetes_manifests(self, components: Dict) -> Dict:
+    def _generate_kubernetes_manifests(self, components: Dict) -> Dict:
         return {}
     
-    async def _generate_ci_cd_pipeline(self, components: Dict) -> Dict:
-        return {
-            "github_actions": """
-name: CI/CD Pipeline
-
-on:
-  push:
-    branches: [main]
-  pull_request:
-    branches: [main]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-    steps:
-      - uses: actions/checkout@v3
-      - name: Run tests
-        run: |
-          docker-compose run backend pytest
-          docker-compose run frontend npm test
-  
-  deploy:
-    needs: test
-    runs-on: ubuntu-latest
-    if: github.ref == 'refs/heads/main'
-    steps:
-      - uses: actions/checkout@v3
-      - name: Deploy
-        run: |
-          echo "Deploy to production"
-"""
-        }
+    def _generate_ci_cd_pipeline(self, components: Dict) -> Dict:
+        return {"github_actions": _CI_GITHUB_ACTIONS}
     
-    async def _extract_env_vars(self, components: Dict) -> Dict:
+    def _extract_env_vars(self, components: Dict) -> Dict:
         env_vars = {
             # Expect these to be provided via runtime env or .env, no insecure defaults
             "DATABASE_URL": "",
@@ -750,13 +1088,12 @@ jobs:
         
         return env_vars
     
-    async def _create_project(self, session: Dict) -> str:
-        import uuid
-        project_id = str(uuid.uuid4())
+    def _create_project(self, session: Dict) -> str:
+        project_id = str(uuid4())
         
         return project_id
     
-    async def _generate_summary(self, session: Dict) -> str:
+    def _generate_summary(self, session: Dict) -> str:
         components = session["generated_components"]
         
         summary = f"""
@@ -773,51 +1110,70 @@ The application has been successfully generated with all requested features.
         
         return summary
     
-    def get_session(self, session_id: str) -> Optional[Dict]:
+    async def get_session(self, session_id: str) -> Optional[Dict]:
         """Get session from memory or load from storage"""
-        # Try memory first
+        shared = self.session_manager.SHARED_SESSIONS
+        if shared and session_id in self._dirty_sessions:
+            # Other workers only see storage, so pending changes go out before it is compared
+            await self.flush_sessions()
+        
+        # Try memory first; with shared storage another worker may have saved a newer copy
         session = self.sessions.get(session_id)
+        if session and (not shared or await self.session_manager.is_current(session_id)):
+            return session
+        
+        # An evicted session with a pending write is newer than its stored copy
+        session = self._dirty_sessions.get(session_id)
         if session:
+            self.sessions[session_id] = session
             return session
         
         # Try loading from storage
-        session = self.session_manager.load_session(session_id)
+        session = await self.session_manager.load_session(session_id)
         if session:
             self.sessions[session_id] = session
             return session
         
         return None
     
-    def _try_recognize_returning_user(self, message: str) -> Optional[Dict]:
+    def evict_session(self, session_id: str) -> None:
+        """Drop the cached copy so the next get_session reads storage"""
+        # A pending write is newer than storage and must not be dropped
+        if session_id not in self._dirty_sessions:
+            self.sessions.pop(session_id, None)
+    
+    async def refresh_generated_components(self, session_id: str) -> None:
+        """Pull generation results written by another process into the cached session"""
+        session = self.sessions.get(session_id) or self._dirty_sessions.get(session_id)
+        if not session:
+            return
+        stored = await self.session_manager.load_session(session_id)
+        if stored:
+            session["generated_components"] = stored.get("generated_components", {})
+            # Requirements extracted by the worker only fill in what this copy lacks
+            for field in ("requirements", "integrations"):
+                if not session.get(field) and stored.get(field):
+                    session[field] = stored[field]
+    
+    async def _try_recognize_returning_user(self, message: str) -> Optional[Dict]:
         """Try to recognize if this is a returning user based on their message"""
         try:
-            # Look for patterns that suggest returning user
-            message_lower = message.lower()
-            
-            # Direct recognition patterns
-            returning_patterns = [
-                "i'm back", "back again", "hello again", "hi again",
-                "remember me", "we talked before", "last time",
-                "continue", "where we left off"
-            ]
-            
-            if any(pattern in message_lower for pattern in returning_patterns):
+            # Direct recognition patterns, matched case-insensitively on the raw message
+            if _RETURNING_RE.search(message):
                 # Try to extract name from message
                 words = message.split()
                 for i, word in enumerate(words):
-                    if word.lower() in ["i'm", "im", "my", "name", "called"]:
+                    if word.lower() in _NAME_LEAD_WORDS:
                         if i + 1 < len(words):
                             potential_name = words[i + 1].strip(",.!")
-                            user = self.session_manager.find_user_by_name(potential_name)
+                            user = await self.session_manager.find_user_by_name(potential_name)
                             if user:
                                 return user
             
             # Check if message contains an email address
-            import re
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, message)
-            if emails:
-                user = self.session_manager.load_user_profile_by_email(emails[0])
+            email = _EMAIL_RE.search(message) if "@" in message else None
+            if email:
+                user = await self.session_manager.load_user_profile_by_email(email.group(0))
                 if user:
                     return user
             
@@ -830,23 +1186,18 @@ The application has been successfully generated with all requested features.
     async def _handle_returning_user(self, session_id: str, user_profile: Dict, initial_message: str) -> Dict:
         """Handle a returning user with existing profile"""
         try:
-            session = self.current_session
+            session = self.sessions.get(session_id)
             
             # Set up session with existing user profile
             session["user_profile"] = user_profile
             session["onboarding_complete"] = True
             session["phase"] = "consultation"
             
-            user_name = user_profile.get("name", "")
-            business_name = user_profile.get("business_name", "")
-            
-            welcome_back_msg = f"""Welcome back, {user_name}! 
-
-I remember you - you run {business_name}, {user_profile.get('business_type', 'your business')}. Last time we were working on {user_profile.get('main_problem', 'improving your operations')}.
-
-{initial_message}
-
-Want to continue where we left off, or do you have a new challenge for me to solve?"""
+            welcome_back_msg = _WELCOME_BACK_TEMPLATE.format_map({
+                **_WELCOME_BACK_DEFAULTS,
+                **user_profile,
+                "initial_message": initial_message
+            })
             
             # Add messages to history
             session["messages"].extend([
@@ -861,7 +1212,7 @@ Want to continue where we left off, or do you have a new challenge for me to sol
             ])
             
             # Save session
-            self.session_manager.save_session(session_id, session)
+            self._mark_dirty(session_id)
             
             return {
                 "session_id": session_id,
@@ -881,50 +1232,31 @@ Want to continue where we left off, or do you have a new challenge for me to sol
     
     def _get_friendly_step_description(self, step: OnboardingStep) -> str:
         """Get user-friendly description of what we need"""
-        descriptions = {
-            OnboardingStep.NAME: "your actual name (not 'hey' or a greeting)",
-            OnboardingStep.EMAIL: "your email address",
-            OnboardingStep.BUSINESS_NAME: "the name of your business",
-            OnboardingStep.BUSINESS_TYPE: "what kind of business you run",
-            OnboardingStep.TEAM_SIZE: "how many people work with you",
-            OnboardingStep.MAIN_PROBLEM: "the main operational challenge you're facing"
-        }
-        return descriptions.get(step, "some information")
+        return _STEP_DESCRIPTIONS.get(step, "some information")
     
     def _get_step_example(self, step: OnboardingStep) -> str:
         """Get helpful example for current step"""
-        examples = {
-            OnboardingStep.NAME: "your name is 'John' or 'Sarah', just type that",
-            OnboardingStep.EMAIL: "you'd type something like 'john@company.com'",
-            OnboardingStep.BUSINESS_NAME: "your company is called 'TechCorp', type 'TechCorp'",
-            OnboardingStep.BUSINESS_TYPE: "you run a 'Law Firm' or 'Marketing Agency', just tell me which",
-            OnboardingStep.TEAM_SIZE: "you have 5 people, just type '5' or '5 people'",
-            OnboardingStep.MAIN_PROBLEM: "you're struggling with 'managing client emails' or 'tracking inventory', describe it briefly"
-        }
-        return examples.get(step, "")
-    
-    def list_sessions(self) -> List[Dict]:
-        """List all sessions from memory and storage"""
-        # Get sessions from storage
-        stored_sessions = self.session_manager.list_sessions()
-        
-        # Merge with in-memory sessions
-        session_ids = set()
-        all_sessions = []
-        
-        # Add stored sessions
-        for session in stored_sessions:
-            session_ids.add(session["id"])
-            all_sessions.append(session)
-        
-        # Add in-memory sessions not in storage
-        for session in self.sessions.values():
-            if session["id"] not in session_ids:
-                all_sessions.append({
-                    "id": session["id"],
-                    "started_at": session["started_at"],
+        return _STEP_EXAMPLES.get(step, "")
+    
+    async def list_sessions(self, limit: Optional[int] = None) -> List[Dict]:
+        """List all sessions from memory and storage, most recently updated first"""
+        # Storage's top `limit` plus every in-memory session always contains the merged top `limit`
+        stored_sessions = await self.session_manager.list_sessions(limit)
+        
+        # Merge with in-memory sessions not in storage, keyed by id and in the storage row shape
+        merged = {session["id"]: session for session in stored_sessions}
+        for session_id, session in self.sessions.items():
+            if session_id not in merged:
+                started_at = session["started_at"]
+                # Not among the stored rows, so its start time stands in for its last update
+                started_at = started_at if isinstance(started_at, str) else started_at.isoformat()
+                merged[session_id] = {
+                    "id": session_id,
+                    "created_at": started_at,
+                    "last_updated": started_at,
                     "phase": session["phase"],
                     "ready_for_generation": session.get("ready_for_generation", False)
-                })
+                }
         
-        return all_sessions
\ No newline at end of file
+        sessions = sorted(merged.values(), key=lambda x: x["last_updated"], reverse=True)
+        return sessions[:limit]
\ No newline at end of file
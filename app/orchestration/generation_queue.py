@@ -0,0 +1,100 @@
+"""
+Generation Job Queue - Runs application generation outside the request
+via a Redis Stream consumed by worker processes
+"""
+
+from typing import Dict, Any, Optional
+import logging
+import uuid
+
+import orjson
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+class GenerationQueue:
+    """Publishes generation jobs and tracks their progress in Redis"""
+    
+    STREAM = "generation:jobs"
+    GROUP = "generation-workers"
+    JOB_PREFIX = "job:"
+    
+    def __init__(self, redis_url: str, job_ttl: int = 24 * 3600):
+        self.redis = redis.Redis.from_url(redis_url)
+        self.job_ttl = job_ttl
+    
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.JOB_PREFIX}{job_id}"
+    
+    async def enqueue(self, session_id: str) -> str:
+        """Queue a generation job for a session and return its job id"""
+        job_id = str(uuid.uuid4())
+        await self._set_job(job_id, {
+            "job_id": job_id,
+            "session_id": session_id,
+            "status": "queued",
+            "stage": None
+        })
+        await self.redis.xadd(self.STREAM, {"job_id": job_id, "session_id": session_id})
+        logger.info(f"Queued generation job {job_id} for session {session_id}")
+        return job_id
+    
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get the current state of a job"""
+        raw = await self.redis.get(self._job_key(job_id))
+        return orjson.loads(raw) if raw else None
+    
+    async def _set_job(self, job_id: str, job: Dict) -> None:
+        await self.redis.set(self._job_key(job_id), orjson.dumps(job, default=str), ex=self.job_ttl)
+    
+    async def _update_job(self, job_id: str, **fields: Any) -> None:
+        job = await self.get_job(job_id) or {"job_id": job_id}
+        job.update(fields)
+        await self._set_job(job_id, job)
+    
+    async def run_worker(self, coordinator, consumer_name: str) -> None:
+        """Consume jobs forever, running each through the coordinator"""
+        try:
+            await self.redis.xgroup_create(self.STREAM, self.GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        
+        logger.info(f"Generation worker {consumer_name} waiting for jobs")
+        while True:
+            response = await self.redis.xreadgroup(
+                self.GROUP, consumer_name, {self.STREAM: ">"}, count=1, block=5000
+            )
+            for _, messages in response or []:
+                for message_id, fields in messages:
+                    await self._process_job(
+                        coordinator,
+                        fields[b"job_id"].decode(),
+                        fields[b"session_id"].decode()
+                    )
+                    await self.redis.xack(self.STREAM, self.GROUP, message_id)
+    
+    async def _process_job(self, coordinator, job_id: str, session_id: str) -> None:
+        await self._update_job(job_id, status="running")
+        # The API keeps changing the session between jobs, so never trust this worker's cached copy
+        coordinator.evict_session(session_id)
+        try:
+            async for event in coordinator.generate_application_stream(session_id):
+                if event["stage"] == "error":
+                    await self._update_job(job_id, status="failed", error=event["error"])
+                elif event["stage"] == "complete":
+                    await self._update_job(
+                        job_id,
+                        status="completed",
+                        stage="complete",
+                        project_id=event["result"]["project_id"],
+                        summary=event["result"]["summary"]
+                    )
+                else:
+                    await self._update_job(job_id, stage=event["stage"])
+        except Exception as e:
+            logger.error(f"Error running generation job {job_id}: {e}")
+            await self._update_job(job_id, status="failed", error=str(e))
+        finally:
+            coordinator.evict_session(session_id)
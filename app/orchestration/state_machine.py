@@ -3,6 +3,7 @@ State Machine for Application Generation Process
 """
 
 from enum import Enum
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 import logging
 
@@ -21,6 +22,39 @@ class GenerationState(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+# Progress reported for each state, built once rather than on every poll
+_STATE_WEIGHTS = MappingProxyType({
+    GenerationState.INITIAL: 0,
+    GenerationState.CONSULTING: 10,
+    GenerationState.REQUIREMENTS_GATHERED: 20,
+    GenerationState.DATABASE_DESIGN: 35,
+    GenerationState.BACKEND_GENERATION: 50,
+    GenerationState.FRONTEND_GENERATION: 65,
+    GenerationState.INTEGRATION_SETUP: 80,
+    GenerationState.TESTING: 90,
+    GenerationState.DEPLOYMENT_READY: 95,
+    GenerationState.COMPLETED: 100,
+    GenerationState.FAILED: -1
+})
+
+# Valid transitions, in preference order
+_TRANSITIONS = MappingProxyType({
+    GenerationState.INITIAL: (GenerationState.CONSULTING,),
+    GenerationState.CONSULTING: (GenerationState.REQUIREMENTS_GATHERED, GenerationState.FAILED),
+    GenerationState.REQUIREMENTS_GATHERED: (GenerationState.DATABASE_DESIGN, GenerationState.FAILED),
+    GenerationState.DATABASE_DESIGN: (GenerationState.BACKEND_GENERATION, GenerationState.FAILED),
+    GenerationState.BACKEND_GENERATION: (GenerationState.FRONTEND_GENERATION, GenerationState.INTEGRATION_SETUP, GenerationState.FAILED),
+    GenerationState.FRONTEND_GENERATION: (GenerationState.INTEGRATION_SETUP, GenerationState.TESTING, GenerationState.FAILED),
+    GenerationState.INTEGRATION_SETUP: (GenerationState.TESTING, GenerationState.FAILED),
+    GenerationState.TESTING: (GenerationState.DEPLOYMENT_READY, GenerationState.FAILED),
+    GenerationState.DEPLOYMENT_READY: (GenerationState.COMPLETED, GenerationState.FAILED),
+    GenerationState.COMPLETED: (),
+    GenerationState.FAILED: (GenerationState.INITIAL,)  # Allow restart
+})
+# Same targets as sets for the membership check on every transition
+_TRANSITION_TARGETS = MappingProxyType({state: frozenset(targets) for state, targets in _TRANSITIONS.items()})
+_TERMINAL_STATES = frozenset({GenerationState.COMPLETED, GenerationState.FAILED})
+
 class ApplicationStateMachine:
     """Manages the state transitions for application generation"""
     
@@ -30,23 +64,11 @@ class ApplicationStateMachine:
         self.context = {}
         
         # Define valid transitions
-        self.transitions = {
-            GenerationState.INITIAL: [GenerationState.CONSULTING],
-            GenerationState.CONSULTING: [GenerationState.REQUIREMENTS_GATHERED, GenerationState.FAILED],
-            GenerationState.REQUIREMENTS_GATHERED: [GenerationState.DATABASE_DESIGN, GenerationState.FAILED],
-            GenerationState.DATABASE_DESIGN: [GenerationState.BACKEND_GENERATION, GenerationState.FAILED],
-            GenerationState.BACKEND_GENERATION: [GenerationState.FRONTEND_GENERATION, GenerationState.INTEGRATION_SETUP, GenerationState.FAILED],
-            GenerationState.FRONTEND_GENERATION: [GenerationState.INTEGRATION_SETUP, GenerationState.TESTING, GenerationState.FAILED],
-            GenerationState.INTEGRATION_SETUP: [GenerationState.TESTING, GenerationState.FAILED],
-            GenerationState.TESTING: [GenerationState.DEPLOYMENT_READY, GenerationState.FAILED],
-            GenerationState.DEPLOYMENT_READY: [GenerationState.COMPLETED, GenerationState.FAILED],
-            GenerationState.COMPLETED: [],
-            GenerationState.FAILED: [GenerationState.INITIAL]  # Allow restart
-        }
+        self.transitions = _TRANSITIONS
     
     def can_transition_to(self, target_state: GenerationState) -> bool:
         """Check if transition to target state is valid"""
-        return target_state in self.transitions.get(self.current_state, [])
+        return target_state in _TRANSITION_TARGETS.get(self.current_state, ())
     
     def transition_to(self, target_state: GenerationState, context: Optional[Dict] = None) -> bool:
         """Transition to a new state"""
@@ -89,29 +111,15 @@ class ApplicationStateMachine:
     
     def get_next_states(self) -> list:
         """Get possible next states from current state"""
-        return self.transitions.get(self.current_state, [])
+        return list(self.transitions.get(self.current_state, ()))
     
     def is_terminal_state(self) -> bool:
         """Check if current state is terminal (no further transitions)"""
-        return self.current_state in [GenerationState.COMPLETED, GenerationState.FAILED]
+        return self.current_state in _TERMINAL_STATES
     
     def get_progress_percentage(self) -> float:
         """Calculate progress percentage based on current state"""
-        state_weights = {
-            GenerationState.INITIAL: 0,
-            GenerationState.CONSULTING: 10,
-            GenerationState.REQUIREMENTS_GATHERED: 20,
-            GenerationState.DATABASE_DESIGN: 35,
-            GenerationState.BACKEND_GENERATION: 50,
-            GenerationState.FRONTEND_GENERATION: 65,
-            GenerationState.INTEGRATION_SETUP: 80,
-            GenerationState.TESTING: 90,
-            GenerationState.DEPLOYMENT_READY: 95,
-            GenerationState.COMPLETED: 100,
-            GenerationState.FAILED: -1
-        }
-        
-        return state_weights.get(self.current_state, 0)
+        return _STATE_WEIGHTS.get(self.current_state, 0)
     
     def validate_state_data(self, state: GenerationState, data: Dict) -> bool:
         """Validate that required data exists for a state transition"""
@@ -1,5 +1,9 @@
 """Storage module for MIOSA application"""
 
 from .session_manager import SessionManager
+from .redis_session_manager import RedisSessionManager
+from .sqlite_session_manager import SqliteSessionManager
+from .session_cache import SessionCache
+from .message_history import MessageHistory
 
-__all__ = ['SessionManager']
\ No newline at end of file
+__all__ = ['SessionManager', 'RedisSessionManager', 'SqliteSessionManager', 'SessionCache', 'MessageHistory']
\ No newline at end of file
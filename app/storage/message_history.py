@@ -0,0 +1,34 @@
+"""Bounded conversation history that keeps track of overflow"""
+
+from collections import deque
+from typing import Dict, Iterable, List
+
+from app.core.constants import MAX_SESSION_MESSAGES
+
+class MessageHistory(deque):
+    """Ring buffer of the most recent messages.
+
+    Messages pushed out of the buffer are held until the next save, which
+    moves them to the session's append-only archive.
+    """
+
+    def __init__(self, messages: Iterable[Dict] = (), maxlen: int = MAX_SESSION_MESSAGES):
+        messages = list(messages)
+        # Sessions saved before the buffer existed can hold more; their head is archived, not dropped
+        overflow = max(len(messages) - maxlen, 0)
+        super().__init__(messages[overflow:], maxlen)
+        self.evicted: List[Dict] = messages[:overflow]
+
+    def append(self, message: Dict) -> None:
+        if len(self) == self.maxlen:
+            self.evicted.append(self[0])
+        super().append(message)
+
+    def extend(self, messages: Iterable[Dict]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def take_evicted(self) -> List[Dict]:
+        """Return and forget the messages pushed out since the last call"""
+        evicted, self.evicted = self.evicted, []
+        return evicted
@@ -0,0 +1,320 @@
+"""Redis Session Storage - Shares session state across worker processes"""
+
+from datetime import datetime
+from typing import Dict, Optional, List
+import heapq
+import logging
+
+import orjson
+import redis.asyncio as redis
+
+from .session_cache import SessionCache
+from .session_manager import SessionManager, _json_default
+
+logger = logging.getLogger(__name__)
+
+class RedisSessionManager(SessionManager):
+    """Stores sessions and user profiles in Redis, shared by every worker process"""
+    
+    STORES_SESSION_FILES = False
+    STORES_PROFILE_FILES = False
+    SHARED_SESSIONS = True
+    SESSION_PREFIX = "session:"
+    INDEX_PREFIX = "session_index:"
+    IDS_KEY = "sessions:index"
+    BUILD_SUFFIX = ":bb"
+    GENERATION_SUFFIX = ":gen"
+    # Fields the generation hash stores next to the components; they only fill in a blob that lacks them
+    GENERATION_INPUTS = ("requirements", "integrations")
+    ARCHIVE_SUFFIX = ":messages_archive"
+    # Bumped by every write to a session, so workers can tell their cached copy is stale
+    REVISION_SUFFIX = ":rev"
+    USER_PREFIX = "user:"
+    USERS_KEY = "users:index"
+    USER_NAME_PREFIX = "users:name:"
+    # Sessions whose last seen revision is remembered
+    REVISION_CACHE_SIZE = 4096
+    
+    def __init__(self, redis_url: str, storage_path: str = "./sessions", ttl: int = 30 * 24 * 3600):
+        super().__init__(storage_path)
+        self.redis = redis.Redis.from_url(redis_url)
+        self.ttl = ttl
+        # Revision of each session as this process last loaded or saved it
+        self._revisions = SessionCache(self.REVISION_CACHE_SIZE)
+    
+    def _key(self, session_id: str) -> str:
+        return f"{self.SESSION_PREFIX}{session_id}"
+    
+    def _index_key(self, session_id: str) -> str:
+        return f"{self.INDEX_PREFIX}{session_id}"
+    
+    def _build_key(self, session_id: str) -> str:
+        return f"{self.SESSION_PREFIX}{session_id}{self.BUILD_SUFFIX}"
+    
+    def _generation_key(self, session_id: str) -> str:
+        return f"{self.SESSION_PREFIX}{session_id}{self.GENERATION_SUFFIX}"
+    
+    def _archive_key(self, session_id: str) -> str:
+        return f"{self.SESSION_PREFIX}{session_id}{self.ARCHIVE_SUFFIX}"
+    
+    def _revision_key(self, session_id: str) -> str:
+        return f"{self.SESSION_PREFIX}{session_id}{self.REVISION_SUFFIX}"
+    
+    def _user_key(self, email: str) -> str:
+        return f"{self.USER_PREFIX}{email}"
+    
+    def _user_name_key(self, name: str) -> str:
+        return f"{self.USER_NAME_PREFIX}{name.lower()}"
+    
+    async def _execute_with_revision(self, session_id: str, pipe) -> None:
+        """Run a write pipeline as one transaction that also bumps the session's revision"""
+        pipe.incr(self._revision_key(session_id))
+        pipe.expire(self._revision_key(session_id), self.ttl)
+        results = await pipe.execute()
+        self._revisions[session_id] = results[-2]
+    
+    async def is_current(self, session_id: str) -> bool:
+        """Whether no other process has written the session since this one last read or wrote it"""
+        known = self._revisions.get(session_id)
+        if known is None:
+            return False
+        revision = await self.redis.get(self._revision_key(session_id))
+        return int(revision or 0) == known
+    
+    async def save_session(self, session_id: str, session_data: Dict) -> bool:
+        """Save session data to Redis"""
+        try:
+            await self._archive_evicted(session_id, session_data)
+            
+            # Session blob and its small index entry go out in one round trip
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.set(self._key(session_id), orjson.dumps(session_data, default=_json_default), ex=self.ttl)
+            pipe.set(self._index_key(session_id), orjson.dumps(self._index_entry(session_data)), ex=self.ttl)
+            pipe.sadd(self.IDS_KEY, session_id)
+            # The blob now carries the latest background_build
+            pipe.delete(self._build_key(session_id))
+            await self._execute_with_revision(session_id, pipe)
+            
+            # Save user profile separately if complete
+            user_profile = session_data.get('user_profile', {})
+            if session_data.get('onboarding_complete') and user_profile.get('email'):
+                await self.save_user_profile(user_profile)
+            
+            logger.info(f"Session {session_id} saved successfully")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving session {session_id}: {e}")
+            return False
+    
+    async def archive_messages(self, session_id: str, messages: List[Dict]) -> None:
+        """RPUSH messages onto the session's archive list"""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.rpush(self._archive_key(session_id), *[orjson.dumps(message, default=str) for message in messages])
+        pipe.expire(self._archive_key(session_id), self.ttl)
+        await pipe.execute()
+    
+    async def load_archived_messages(self, session_id: str) -> List[Dict]:
+        """Messages older than the session's history buffer, oldest first"""
+        return [orjson.loads(raw) for raw in await self.redis.lrange(self._archive_key(session_id), 0, -1)]
+    
+    async def save_build_status(self, session_id: str, session_data: Dict) -> bool:
+        """Write only background_build to its own hash instead of the whole session"""
+        try:
+            build = session_data.get("background_build", {})
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hset(
+                self._build_key(session_id),
+                mapping={field: orjson.dumps(value, default=str) for field, value in build.items()}
+            )
+            pipe.expire(self._build_key(session_id), self.ttl)
+            await self._execute_with_revision(session_id, pipe)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving build status for {session_id}: {e}")
+            return False
+    
+    async def save_generation_results(self, session_id: str, session_data: Dict) -> bool:
+        """Write only generation results to their own hash.
+        
+        Generation runs in a worker while the API keeps saving the same session,
+        so neither side may write the whole blob over the other's changes. The hash
+        is never cleared by a full save. Its components always win over the blob's
+        copy; the requirements and integrations generation extracted only fill in
+        a blob without any, so a later background plan is never hidden.
+        """
+        try:
+            mapping = {
+                name: orjson.dumps(value, default=str)
+                for name, value in session_data.get("generated_components", {}).items()
+            }
+            for field in self.GENERATION_INPUTS:
+                if session_data.get(field):
+                    mapping[field] = orjson.dumps(session_data[field], default=str)
+            if not mapping:
+                return True
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hset(self._generation_key(session_id), mapping=mapping)
+            pipe.expire(self._generation_key(session_id), self.ttl)
+            await self._execute_with_revision(session_id, pipe)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving generation results for {session_id}: {e}")
+            return False
+    
+    async def load_session(self, session_id: str) -> Optional[Dict]:
+        """Load session data from Redis"""
+        try:
+            # One transaction, so the revision matches the blob and hashes read with it
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.get(self._key(session_id))
+            pipe.hgetall(self._build_key(session_id))
+            pipe.hgetall(self._generation_key(session_id))
+            pipe.get(self._revision_key(session_id))
+            raw, build, generated, revision = await pipe.execute()
+            if raw is None:
+                logger.warning(f"Session {session_id} not found")
+                return None
+            self._revisions[session_id] = int(revision or 0)
+            
+            session_data = orjson.loads(raw)
+            if build:
+                # Build status written since the last full save is newer than the blob's copy
+                session_data.setdefault("background_build", {}).update(
+                    {field.decode(): orjson.loads(value) for field, value in build.items()}
+                )
+            if generated:
+                components = session_data.setdefault("generated_components", {})
+                for name, value in generated.items():
+                    name = name.decode()
+                    if name not in self.GENERATION_INPUTS:
+                        components[name] = orjson.loads(value)
+                    elif not session_data.get(name):
+                        session_data[name] = orjson.loads(value)
+            self._restore_types(session_data)
+            
+            logger.info(f"Session {session_id} loaded successfully")
+            return session_data
+            
+        except Exception as e:
+            logger.error(f"Error loading session {session_id}: {e}")
+            return None
+    
+    async def delete_session(self, session_id: str) -> bool:
+        """Delete a session from Redis"""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(
+                self._key(session_id),
+                self._index_key(session_id),
+                self._build_key(session_id),
+                self._generation_key(session_id),
+                self._revision_key(session_id),
+                self._archive_key(session_id)
+            )
+            pipe.srem(self.IDS_KEY, session_id)
+            await pipe.execute()
+            self._revisions.pop(session_id, None)
+            logger.info(f"Session {session_id} deleted")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting session {session_id}: {e}")
+            return False
+    
+    async def list_sessions(self, limit: Optional[int] = None) -> List[Dict]:
+        """List all sessions stored in Redis"""
+        # Session ids come from a set maintained on save/delete, never a KEYS/SCAN walk
+        session_ids = [sid.decode() for sid in await self.redis.smembers(self.IDS_KEY)]
+        if not session_ids:
+            return []
+        
+        # Only the index entries are fetched, pipelined into a single round trip
+        pipe = self.redis.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.get(self._index_key(session_id))
+        
+        sessions = []
+        expired = []
+        for session_id, raw in zip(session_ids, await pipe.execute()):
+            if raw is None:
+                expired.append(session_id)
+                continue
+            info = orjson.loads(raw)
+            sessions.append({
+                "id": session_id,
+                "created_at": info["created_at"],
+                "last_updated": info["last_updated"],
+                "phase": info["phase"],
+                "ready_for_generation": info.get("ready_for_generation", False)
+            })
+        
+        # Drop ids whose entries have expired through their TTL
+        if expired:
+            await self.redis.srem(self.IDS_KEY, *expired)
+        
+        if limit is not None:
+            return heapq.nlargest(limit, sessions, key=lambda x: x["last_updated"])
+        return sorted(sessions, key=lambda x: x["last_updated"], reverse=True)
+    
+    async def cleanup_old_sessions(self, days: int = 30):
+        """Sessions expire through their Redis TTL; nothing to sweep"""
+        logger.info("Redis sessions expire via TTL; skipping cleanup")
+    
+    async def save_user_profile(self, profile: Dict) -> bool:
+        """Save user profile to Redis, with its users index and name index entries"""
+        try:
+            email = profile.get('email', '').lower()
+            if not email:
+                logger.warning("Cannot save user profile without email")
+                return False
+            
+            now = datetime.now().isoformat()
+            profile_data = {**profile, "created_at": now, "last_updated": now}
+            summary = {
+                "name": profile.get('name', ''),
+                "business_name": profile.get('business_name', ''),
+                "business_type": profile.get('business_type', ''),
+                "created_at": now,
+                "last_updated": now
+            }
+            
+            previous = await self.redis.hget(self.USERS_KEY, email)
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.set(self._user_key(email), orjson.dumps(profile_data, default=_json_default))
+            pipe.hset(self.USERS_KEY, email, orjson.dumps(summary))
+            if previous is not None:
+                pipe.srem(self._user_name_key(orjson.loads(previous).get('name', '')), email)
+            pipe.sadd(self._user_name_key(summary["name"]), email)
+            await pipe.execute()
+            
+            logger.info(f"User profile saved for {email}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error saving user profile: {e}")
+            return False
+    
+    async def load_user_profile_by_email(self, email: str) -> Optional[Dict]:
+        """Load user profile by email"""
+        try:
+            raw = await self.redis.get(self._user_key(email.lower()))
+            return orjson.loads(raw) if raw else None
+        except Exception as e:
+            logger.error(f"Error loading user profile for {email}: {e}")
+            return None
+    
+    async def find_user_by_name(self, name: str) -> Optional[Dict]:
+        """Find user profile by name (case insensitive) through the name index sets"""
+        for email in sorted(await self.redis.smembers(self._user_name_key(name))):
+            profile = await self.load_user_profile_by_email(email.decode())
+            if profile:
+                return profile
+        return None
+    
+    async def list_users(self) -> List[Dict]:
+        """List all user profiles"""
+        users = [
+            {"email": email.decode(), **orjson.loads(summary)}
+            for email, summary in (await self.redis.hgetall(self.USERS_KEY)).items()
+        ]
+        return sorted(users, key=lambda x: x["last_updated"], reverse=True)
@@ -0,0 +1,23 @@
+"""In-process LRU cache for hot sessions"""
+
+from collections import OrderedDict
+from typing import Any, Optional
+
+class SessionCache(OrderedDict):
+    """Size-bounded session map that evicts the least recently used entry"""
+    
+    def __init__(self, maxsize: int = 1024):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def get(self, key: str, default: Optional[Any] = None) -> Optional[Any]:
+        if key in self:
+            self.move_to_end(key)
+            return super().__getitem__(key)
+        return default
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
@@ -1,74 +1,217 @@
 """Session Storage Manager - Handles persistent session storage"""
 
-import json
+import asyncio
+import atexit
+import hashlib
+import heapq
+import mmap
 import os
-from typing import Dict, Optional, List
-from datetime import datetime
+import shutil
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, List, Union
+from datetime import datetime, timedelta
 from pathlib import Path
+from uuid import uuid4
 import logging
 
+import aiofiles
+import aiofiles.os
+import orjson
+
+from app.core.onboarding import OnboardingStep
+from .message_history import MessageHistory
+from .session_cache import SessionCache
+
 logger = logging.getLogger(__name__)
 
+def _json_default(obj):
+    """orjson fallback: message history deques become lists"""
+    if isinstance(obj, deque):
+        return list(obj)
+    return str(obj)
+
+@dataclass(slots=True, frozen=True)
+class IndexEntry:
+    """Summary kept in the sessions index; orjson writes it as a plain JSON object"""
+    created_at: str = ""
+    last_updated: str = ""
+    phase: str = "initial"
+    ready_for_generation: bool = False
+    user_name: str = ""
+    business_name: str = ""
+    onboarding_complete: bool = False
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "IndexEntry":
+        # Unknown keys from older index files are dropped
+        return cls(**{field.name: data[field.name] for field in fields(cls) if field.name in data})
+
+def _load_json_mapped(path: Path) -> Dict:
+    """Parse a JSON file straight from a read-only mapping of its pages, with no read() copy"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+
+def _temp_path(path: Union[str, Path]) -> str:
+    # Unique per write so concurrent saves of one file never share a temp file
+    return f"{path}.{uuid4().hex}.tmp"
+
+def _export_archive_path(export_file: Path) -> Path:
+    """Where an export's archived messages live: session.json -> session.messages.jsonl"""
+    return export_file.with_suffix(".messages.jsonl")
+
+async def _write_atomic(path: Union[str, Path], data: bytes, fsync: bool = False) -> None:
+    """Write to a sibling temp file, then rename it over path so readers never see a partial file"""
+    tmp = _temp_path(path)
+    async with aiofiles.open(tmp, 'wb') as f:
+        await f.write(data)
+        if fsync:
+            # Contents reach the disk before the rename can
+            await f.flush()
+            await asyncio.to_thread(os.fsync, f.fileno())
+    await aiofiles.os.replace(tmp, path)
+
 class SessionManager:
     """Manages session persistence and retrieval"""
     
-    def __init__(self, storage_path: str = "./sessions"):
+    # Sessions live in <id>.json files, listed by index.json, that export_session can copy as-is
+    STORES_SESSION_FILES = True
+    # User profiles live in users/<shard>/<email>.json with a users/index.json
+    STORES_PROFILE_FILES = True
+    # Other processes write the same sessions, so cached copies must be checked with is_current
+    SHARED_SESSIONS = False
+    # User profiles kept in memory after their first load from disk
+    PROFILE_CACHE_SIZE = 256
+    # index.json is rewritten after this many updates, or this many seconds after the first pending one
+    INDEX_FLUSH_UPDATES = 32
+    INDEX_FLUSH_INTERVAL = 5.0
+    
+    def __init__(self, storage_path: str = "./sessions", durable_writes: bool = False):
         self.storage_path = Path(storage_path)
+        # Off: writes are atomic but a power loss can drop the latest saves.
+        # On: session and profile files are fsynced before they replace the old copy.
+        self.durable_writes = durable_writes
+        # Per-session paths are built by string concatenation on this prefix, not Path joins
+        self._storage_prefix = os.path.join(str(self.storage_path), "")
         self.storage_path.mkdir(parents=True, exist_ok=True)
-        # Create users directory for profile storage
+        if self.STORES_SESSION_FILES:
+            self._init_session_index()
+        if self.STORES_PROFILE_FILES:
+            self._init_user_profiles()
+    
+    def _init_session_index(self):
+        """Load index.json and set up its batched writes"""
+        self.sessions_index = self._load_index()
+        self._index_pending = 0
+        self._index_flush_task = None
+        self._index_lock = asyncio.Lock()
+        # Sorted list_sessions result, rebuilt after the index changes
+        self._sessions_listing: Optional[List[Dict]] = None
+        atexit.register(self._flush_index_sync)
+    
+    def _init_user_profiles(self):
+        """Load the users index for profiles stored under users/"""
         self.users_path = self.storage_path / "users"
         self.users_path.mkdir(parents=True, exist_ok=True)
-        self.sessions_index = self._load_index()
         self.users_index = self._load_users_index()
+        # Lowercased name -> emails, so returning-user lookups skip the users_index scan
+        self._name_to_emails: Dict[str, List[str]] = {}
+        for email, info in self.users_index.items():
+            self._name_to_emails.setdefault(info.get('name', '').lower(), []).append(email)
+        self._profile_cache = SessionCache(self.PROFILE_CACHE_SIZE)
         
-    def _load_index(self) -> Dict:
+    def _load_index(self) -> Dict[str, IndexEntry]:
         """Load sessions index from file"""
         index_file = self.storage_path / "index.json"
         if index_file.exists():
             try:
-                with open(index_file, 'r') as f:
-                    return json.load(f)
+                return {
+                    session_id: IndexEntry.from_dict(info)
+                    for session_id, info in _load_json_mapped(index_file).items()
+                }
             except Exception as e:
                 logger.error(f"Error loading index: {e}")
                 return {}
         return {}
     
-    def _save_index(self):
-        """Save sessions index to file"""
-        index_file = self.storage_path / "index.json"
+    async def _save_index(self):
+        """Record an index update, writing the file once enough have accumulated"""
+        self._index_pending += 1
+        if self._index_pending >= self.INDEX_FLUSH_UPDATES:
+            await self.flush()
+        elif self._index_flush_task is None or self._index_flush_task.done():
+            # Trailing write so a quiet period never leaves updates only in memory
+            self._index_flush_task = asyncio.create_task(self._flush_after_interval())
+    
+    async def _flush_after_interval(self):
+        await asyncio.sleep(self.INDEX_FLUSH_INTERVAL)
+        await self.flush()
+    
+    async def flush(self):
+        """Write pending sessions index updates to file"""
+        if not self.STORES_SESSION_FILES:
+            return
+        # Serialized so an older snapshot can never be renamed over a newer one
+        async with self._index_lock:
+            if not self._index_pending:
+                return
+            index_file = self.storage_path / "index.json"
+            # Updates made while the write is in flight stay pending for the next flush
+            pending, self._index_pending = self._index_pending, 0
+            try:
+                await _write_atomic(index_file, orjson.dumps(self.sessions_index, default=str), fsync=True)
+            except Exception as e:
+                self._index_pending += pending
+                logger.error(f"Error saving index: {e}")
+    
+    async def shutdown(self):
+        """Write pending index updates and drop the exit hook"""
+        if not self.STORES_SESSION_FILES:
+            return
+        if self._index_flush_task is not None:
+            self._index_flush_task.cancel()
+        await self.flush()
+        atexit.unregister(self._flush_index_sync)
+    
+    def _flush_index_sync(self):
+        """Last-chance index write for interpreters exiting without a shutdown"""
+        if not self._index_pending:
+            return
         try:
-            with open(index_file, 'w') as f:
-                json.dump(self.sessions_index, f, indent=2, default=str)
+            index_file = self.storage_path / "index.json"
+            tmp = _temp_path(index_file)
+            with open(tmp, 'wb') as f:
+                f.write(orjson.dumps(self.sessions_index, default=str))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, index_file)
+            self._index_pending = 0
         except Exception as e:
             logger.error(f"Error saving index: {e}")
     
-    def save_session(self, session_id: str, session_data: Dict) -> bool:
+    async def save_session(self, session_id: str, session_data: Dict) -> bool:
         """Save session data to disk"""
         try:
-            session_file = self.storage_path / f"{session_id}.json"
+            session_file = self._session_file(session_id)
             
-            # Ensure datetime objects are serialized
-            serializable_data = self._make_serializable(session_data)
+            # Archive messages that fell out of the history buffer before they're lost
+            await self._archive_evicted(session_id, session_data)
             
-            with open(session_file, 'w') as f:
-                json.dump(serializable_data, f, indent=2, default=str)
+            # orjson writes datetimes natively; only deques need the fallback
+            await _write_atomic(session_file, orjson.dumps(session_data, default=_json_default), fsync=self.durable_writes)
             
             # Update index with user info
             user_profile = session_data.get('user_profile', {})
-            self.sessions_index[session_id] = {
-                "created_at": session_data.get("started_at", datetime.now()).isoformat(),
-                "last_updated": datetime.now().isoformat(),
-                "phase": session_data.get("phase", "initial"),
-                "ready_for_generation": session_data.get("ready_for_generation", False),
-                "user_name": user_profile.get('name', ''),
-                "business_name": user_profile.get('business_name', ''),
-                "onboarding_complete": session_data.get('onboarding_complete', False)
-            }
-            self._save_index()
+            self.sessions_index[session_id] = self._index_entry(session_data)
+            self._sessions_listing = None
+            await self._save_index()
             
             # Save user profile separately if complete
             if session_data.get('onboarding_complete') and user_profile.get('email'):
-                self.save_user_profile(user_profile)
+                await self.save_user_profile(user_profile)
             
             logger.info(f"Session {session_id} saved successfully")
             return True
@@ -77,21 +220,80 @@ class SessionManager:
             logger.error(f"Error saving session {session_id}: {e}")
             return False
     
-    def load_session(self, session_id: str) -> Optional[Dict]:
+    async def _archive_evicted(self, session_id: str, session_data: Dict) -> None:
+        messages = session_data.get("messages")
+        if isinstance(messages, MessageHistory) and messages.evicted:
+            await self.archive_messages(session_id, messages.take_evicted())
+    
+    def _session_file(self, session_id: str) -> str:
+        return f"{self._storage_prefix}{session_id}.json"
+    
+    def _archive_file(self, session_id: str) -> str:
+        return f"{self._storage_prefix}{session_id}.messages.jsonl"
+    
+    async def archive_messages(self, session_id: str, messages: List[Dict]) -> None:
+        """Append messages to the session's append-only archive"""
+        async with aiofiles.open(self._archive_file(session_id), 'ab') as f:
+            await f.write(b"".join(orjson.dumps(message, default=str) + b"\n" for message in messages))
+    
+    async def load_archived_messages(self, session_id: str) -> List[Dict]:
+        """Messages older than the session's history buffer, oldest first"""
+        archive_file = self._archive_file(session_id)
+        if not os.path.exists(archive_file):
+            return []
+        async with aiofiles.open(archive_file, 'rb') as f:
+            return [orjson.loads(line) for line in (await f.read()).splitlines() if line]
+    
+    async def is_current(self, session_id: str) -> bool:
+        """Whether a cached copy of the session is still the latest; only this process writes here"""
+        return True
+    
+    async def save_build_status(self, session_id: str, session_data: Dict) -> bool:
+        """Persist a background_build change; on disk this is a full session save"""
+        return await self.save_session(session_id, session_data)
+    
+    async def save_generation_results(self, session_id: str, session_data: Dict) -> bool:
+        """Persist generated_components after a generation stage; on disk this is a full session save"""
+        return await self.save_session(session_id, session_data)
+    
+    def _index_entry(self, session_data: Dict) -> IndexEntry:
+        """Build the index summary stored for a session"""
+        user_profile = session_data.get('user_profile', {})
+        now = datetime.now()
+        started_at = session_data.get("started_at", now)
+        return IndexEntry(
+            # Loaded sessions keep the stored ISO string; new ones still hold a datetime
+            created_at=started_at if isinstance(started_at, str) else started_at.isoformat(),
+            last_updated=now.isoformat(),
+            phase=session_data.get("phase", "initial"),
+            ready_for_generation=session_data.get("ready_for_generation", False),
+            user_name=user_profile.get('name', ''),
+            business_name=user_profile.get('business_name', ''),
+            onboarding_complete=session_data.get('onboarding_complete', False)
+        )
+    
+    def _restore_types(self, session_data: Dict) -> None:
+        """Convert serialized fields back to their in-memory types"""
+        if isinstance(session_data.get("messages"), list):
+            session_data["messages"] = MessageHistory(session_data["messages"])
+        step = session_data.get("onboarding_step")
+        if isinstance(step, str):
+            # Older files stored the enum repr ("OnboardingStep.EMAIL")
+            session_data["onboarding_step"] = OnboardingStep(step.split(".")[-1].lower())
+    
+    async def load_session(self, session_id: str) -> Optional[Dict]:
         """Load session data from disk"""
         try:
-            session_file = self.storage_path / f"{session_id}.json"
+            session_file = self._session_file(session_id)
             
-            if not session_file.exists():
+            if not os.path.exists(session_file):
                 logger.warning(f"Session {session_id} not found")
                 return None
             
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
+            async with aiofiles.open(session_file, 'rb') as f:
+                session_data = orjson.loads(await f.read())
             
-            # Convert date strings back to datetime objects if needed
-            if "started_at" in session_data and isinstance(session_data["started_at"], str):
-                session_data["started_at"] = datetime.fromisoformat(session_data["started_at"])
+            self._restore_types(session_data)
             
             logger.info(f"Session {session_id} loaded successfully")
             return session_data
@@ -100,17 +302,15 @@ class SessionManager:
             logger.error(f"Error loading session {session_id}: {e}")
             return None
     
-    def delete_session(self, session_id: str) -> bool:
+    async def delete_session(self, session_id: str) -> bool:
         """Delete a session from storage"""
         try:
-            session_file = self.storage_path / f"{session_id}.json"
-            
-            if session_file.exists():
-                session_file.unlink()
+            await self._remove_session_files(session_id)
             
             if session_id in self.sessions_index:
                 del self.sessions_index[session_id]
-                self._save_index()
+                self._sessions_listing = None
+                await self._save_index()
             
             logger.info(f"Session {session_id} deleted")
             return True
@@ -119,59 +319,104 @@ class SessionManager:
             logger.error(f"Error deleting session {session_id}: {e}")
             return False
     
-    def list_sessions(self) -> List[Dict]:
-        """List all available sessions"""
-        sessions = []
-        for session_id, info in self.sessions_index.items():
-            sessions.append({
-                "id": session_id,
-                "created_at": info["created_at"],
-                "last_updated": info["last_updated"],
-                "phase": info["phase"],
-                "ready_for_generation": info.get("ready_for_generation", False)
-            })
-        return sorted(sessions, key=lambda x: x["last_updated"], reverse=True)
+    async def _remove_session_files(self, session_id: str) -> None:
+        for path in (self._session_file(session_id), self._archive_file(session_id)):
+            if os.path.exists(path):
+                await aiofiles.os.remove(path)
     
-    def cleanup_old_sessions(self, days: int = 30):
+    def _listing_entry(self, session_id: str, info: IndexEntry) -> Dict:
+        return {
+            "id": session_id,
+            "created_at": info.created_at,
+            "last_updated": info.last_updated,
+            "phase": info.phase,
+            "ready_for_generation": info.ready_for_generation
+        }
+    
+    async def list_sessions(self, limit: Optional[int] = None) -> List[Dict]:
+        """List available sessions, most recently updated first"""
+        if self._sessions_listing is None and limit is not None:
+            # Top-N without sorting (or materializing) the whole index
+            return heapq.nlargest(
+                limit,
+                (self._listing_entry(session_id, info) for session_id, info in self.sessions_index.items()),
+                key=lambda x: x["last_updated"]
+            )
+        if self._sessions_listing is None:
+            self._sessions_listing = sorted(
+                (self._listing_entry(session_id, info) for session_id, info in self.sessions_index.items()),
+                key=lambda x: x["last_updated"],
+                reverse=True
+            )
+        return self._sessions_listing[:limit]
+    
+    async def cleanup_old_sessions(self, days: int = 30):
         """Remove sessions older than specified days"""
-        from datetime import timedelta
-        
         cutoff_date = datetime.now() - timedelta(days=days)
         sessions_to_delete = []
         
         for session_id, info in self.sessions_index.items():
-            last_updated = datetime.fromisoformat(info["last_updated"])
+            last_updated = datetime.fromisoformat(info.last_updated)
             if last_updated < cutoff_date:
                 sessions_to_delete.append(session_id)
         
-        for session_id in sessions_to_delete:
-            self.delete_session(session_id)
+        # Removals overlap on aiofiles' thread pool; the index is then updated and written once
+        results = await asyncio.gather(
+            *[self._remove_session_files(session_id) for session_id in sessions_to_delete],
+            return_exceptions=True
+        )
+        for session_id, result in zip(sessions_to_delete, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error deleting session {session_id}: {result}")
+            else:
+                del self.sessions_index[session_id]
+        if sessions_to_delete:
+            self._sessions_listing = None
+            self._index_pending += 1
+            await self.flush()
         
         logger.info(f"Cleaned up {len(sessions_to_delete)} old sessions")
     
-    def _make_serializable(self, obj):
-        """Convert non-serializable objects to serializable format"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: self._make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_serializable(item) for item in obj]
-        else:
-            return obj
-    
-    def export_session(self, session_id: str, export_path: str) -> bool:
-        """Export a session to a specified path"""
+    async def export_session(self, session_id: str, export_path: str) -> bool:
+        """Export a session to a specified path.
+        
+        Archived messages go to a .messages.jsonl file next to the export,
+        where import_session picks them up again.
+        """
         try:
-            session_data = self.load_session(session_id)
+            export_file = Path(export_path)
+            archive_export = _export_archive_path(export_file)
+            
+            session_file = self._session_file(session_id)
+            if self.STORES_SESSION_FILES:
+                if not os.path.exists(session_file):
+                    return False
+                export_file.parent.mkdir(parents=True, exist_ok=True)
+                # The stored files already are the export format; copy them without a parse/dump round trip
+                await asyncio.to_thread(shutil.copyfile, session_file, export_file)
+                archive_file = self._archive_file(session_id)
+                if os.path.exists(archive_file):
+                    await asyncio.to_thread(shutil.copyfile, archive_file, archive_export)
+                else:
+                    archive_export.unlink(missing_ok=True)
+                logger.info(f"Session {session_id} exported to {export_path}")
+                return True
+            
+            session_data = await self.load_session(session_id)
             if not session_data:
                 return False
             
-            export_file = Path(export_path)
             export_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(export_file, 'w') as f:
-                json.dump(session_data, f, indent=2, default=str)
+            async with aiofiles.open(export_file, 'wb') as f:
+                await f.write(orjson.dumps(session_data, option=orjson.OPT_INDENT_2, default=_json_default))
+            
+            archived = await self.load_archived_messages(session_id)
+            if archived:
+                async with aiofiles.open(archive_export, 'wb') as f:
+                    await f.write(b"".join(orjson.dumps(message, default=str) + b"\n" for message in archived))
+            else:
+                archive_export.unlink(missing_ok=True)
             
             logger.info(f"Session {session_id} exported to {export_path}")
             return True
@@ -180,25 +425,33 @@ class SessionManager:
             logger.error(f"Error exporting session {session_id}: {e}")
             return False
     
-    def import_session(self, import_path: str, session_id: Optional[str] = None) -> Optional[str]:
-        """Import a session from a file"""
+    async def import_session(self, import_path: str, session_id: Optional[str] = None) -> Optional[str]:
+        """Import a session from a file, with its archived messages if exported alongside"""
         try:
             import_file = Path(import_path)
             if not import_file.exists():
                 logger.error(f"Import file {import_path} not found")
                 return None
             
-            with open(import_file, 'r') as f:
-                session_data = json.load(f)
+            async with aiofiles.open(import_file, 'rb') as f:
+                session_data = orjson.loads(await f.read())
             
             # Generate new session ID if not provided
             if not session_id:
-                import uuid
-                session_id = str(uuid.uuid4())
+                session_id = str(uuid4())
             
             session_data["id"] = session_id
+            # Same in-memory types as load_session, which the index entry relies on
+            self._restore_types(session_data)
+            
+            archive_import = _export_archive_path(import_file)
+            if archive_import.exists():
+                async with aiofiles.open(archive_import, 'rb') as f:
+                    archived = [orjson.loads(line) for line in (await f.read()).splitlines() if line]
+                if archived:
+                    await self.archive_messages(session_id, archived)
             
-            if self.save_session(session_id, session_data):
+            if await self.save_session(session_id, session_data):
                 logger.info(f"Session imported as {session_id}")
                 return session_id
             
@@ -213,23 +466,21 @@ class SessionManager:
         users_index_file = self.users_path / "index.json"
         if users_index_file.exists():
             try:
-                with open(users_index_file, 'r') as f:
-                    return json.load(f)
+                return _load_json_mapped(users_index_file)
             except Exception as e:
                 logger.error(f"Error loading users index: {e}")
                 return {}
         return {}
     
-    def _save_users_index(self):
+    async def _save_users_index(self):
         """Save users index to file"""
         users_index_file = self.users_path / "index.json"
         try:
-            with open(users_index_file, 'w') as f:
-                json.dump(self.users_index, f, indent=2, default=str)
+            await _write_atomic(users_index_file, orjson.dumps(self.users_index, default=str), fsync=self.durable_writes)
         except Exception as e:
             logger.error(f"Error saving users index: {e}")
     
-    def save_user_profile(self, profile: Dict) -> bool:
+    async def save_user_profile(self, profile: Dict) -> bool:
         """Save user profile to disk"""
         try:
             email = profile.get('email', '').lower()
@@ -239,30 +490,42 @@ class SessionManager:
             
             # Use email as filename (sanitized)
             safe_email = email.replace('@', '_at_').replace('.', '_')
-            profile_file = self.users_path / f"{safe_email}.json"
+            # Spread profiles over 256 subdirectories so no single directory grows huge
+            shard = hashlib.blake2s(email.encode(), digest_size=1).hexdigest()
+            relative_file = f"{shard}/{safe_email}.json"
+            profile_file = self.users_path / relative_file
+            profile_file.parent.mkdir(exist_ok=True)
             
             # Add metadata
+            now = datetime.now().isoformat()
             profile_data = {
                 **profile,
-                "created_at": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat()
+                "created_at": now,
+                "last_updated": now
             }
             
             # Save profile
-            serializable_data = self._make_serializable(profile_data)
-            with open(profile_file, 'w') as f:
-                json.dump(serializable_data, f, indent=2, default=str)
+            await _write_atomic(profile_file, orjson.dumps(profile_data, default=_json_default), fsync=self.durable_writes)
+            
+            self._profile_cache[email] = profile_data
             
             # Update users index
+            previous = self.users_index.get(email)
+            if previous is not None:
+                self._name_to_emails.get(previous.get('name', '').lower(), []).remove(email)
+                # Profiles saved before sharding sit directly in users/
+                if previous.get("file") != relative_file and (self.users_path / previous["file"]).exists():
+                    await aiofiles.os.remove(self.users_path / previous["file"])
+            self._name_to_emails.setdefault(profile.get('name', '').lower(), []).append(email)
             self.users_index[email] = {
                 "name": profile.get('name', ''),
                 "business_name": profile.get('business_name', ''),
                 "business_type": profile.get('business_type', ''),
                 "created_at": profile_data["created_at"],
                 "last_updated": profile_data["last_updated"],
-                "file": f"{safe_email}.json"
+                "file": relative_file
             }
-            self._save_users_index()
+            await self._save_users_index()
             
             logger.info(f"User profile saved for {email}")
             return True
@@ -271,13 +534,18 @@ class SessionManager:
             logger.error(f"Error saving user profile: {e}")
             return False
     
-    def load_user_profile_by_email(self, email: str) -> Optional[Dict]:
+    async def load_user_profile_by_email(self, email: str) -> Optional[Dict]:
         """Load user profile by email"""
         try:
             email = email.lower()
             if email not in self.users_index:
                 return None
             
+            # Copies keep callers' edits out of the cached profile
+            cached = self._profile_cache.get(email)
+            if cached is not None:
+                return dict(cached)
+            
             profile_info = self.users_index[email]
             profile_file = self.users_path / profile_info["file"]
             
@@ -285,25 +553,26 @@ class SessionManager:
                 logger.warning(f"Profile file not found for {email}")
                 return None
             
-            with open(profile_file, 'r') as f:
-                profile_data = json.load(f)
+            async with aiofiles.open(profile_file, 'rb') as f:
+                profile_data = orjson.loads(await f.read())
+            self._profile_cache[email] = profile_data
             
             logger.info(f"User profile loaded for {email}")
-            return profile_data
+            return dict(profile_data)
             
         except Exception as e:
             logger.error(f"Error loading user profile for {email}: {e}")
             return None
     
-    def find_user_by_name(self, name: str) -> Optional[Dict]:
+    async def find_user_by_name(self, name: str) -> Optional[Dict]:
         """Find user profile by name (case insensitive)"""
-        name_lower = name.lower()
-        for email, profile_info in self.users_index.items():
-            if profile_info.get('name', '').lower() == name_lower:
-                return self.load_user_profile_by_email(email)
+        for email in self._name_to_emails.get(name.lower(), ()):
+            profile = await self.load_user_profile_by_email(email)
+            if profile:
+                return profile
         return None
     
-    def list_users(self) -> List[Dict]:
+    async def list_users(self) -> List[Dict]:
         """List all user profiles"""
         users = []
         for email, info in self.users_index.items():
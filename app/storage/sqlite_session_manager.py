@@ -0,0 +1,242 @@
+"""SQLite Session Storage - One WAL-mode database file instead of per-session JSON"""
+
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, List
+import logging
+
+import orjson
+
+from .session_manager import SessionManager, _json_default
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    last_updated TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    ready_for_generation INTEGER NOT NULL DEFAULT 0,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_last_updated ON sessions(last_updated);
+CREATE TABLE IF NOT EXISTS session_archive (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_archive_session ON session_archive(session_id, seq);
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    business_name TEXT NOT NULL DEFAULT '',
+    business_type TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    last_updated TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_name ON users(name COLLATE NOCASE);
+"""
+
+class SqliteSessionManager(SessionManager):
+    """Stores sessions and user profiles in a single SQLite database"""
+    
+    STORES_SESSION_FILES = False
+    STORES_PROFILE_FILES = False
+    DB_FILE = "sessions.db"
+    
+    def __init__(self, storage_path: str = "./sessions", durable_writes: bool = False):
+        super().__init__(storage_path, durable_writes)
+        self.conn = sqlite3.connect(
+            self.storage_path / self.DB_FILE,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent at NORMAL; only the last commits can be lost on power failure.
+        # FULL syncs the WAL on every commit.
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if durable_writes else 'NORMAL'}")
+        self.conn.executescript(_SCHEMA)
+        # Statements run in worker threads so the event loop never waits on disk
+        self._lock = threading.Lock()
+    
+    def _execute(self, sql: str, params=(), many: bool = False) -> List[tuple]:
+        with self._lock:
+            if many:
+                self.conn.executemany(sql, params)
+                return []
+            return self.conn.execute(sql, params).fetchall()
+    
+    async def _run(self, sql: str, params=(), many: bool = False) -> List[tuple]:
+        return await asyncio.to_thread(self._execute, sql, params, many)
+    
+    async def save_session(self, session_id: str, session_data: Dict) -> bool:
+        """Save session data to SQLite"""
+        try:
+            await self._archive_evicted(session_id, session_data)
+            
+            entry = self._index_entry(session_data)
+            await self._run(
+                "INSERT OR REPLACE INTO sessions (id, created_at, last_updated, phase, ready_for_generation, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    session_id,
+                    entry.created_at,
+                    entry.last_updated,
+                    entry.phase,
+                    int(bool(entry.ready_for_generation)),
+                    orjson.dumps(session_data, default=_json_default)
+                )
+            )
+            
+            # Save user profile separately if complete
+            user_profile = session_data.get('user_profile', {})
+            if session_data.get('onboarding_complete') and user_profile.get('email'):
+                await self.save_user_profile(user_profile)
+            
+            logger.info(f"Session {session_id} saved successfully")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error saving session {session_id}: {e}")
+            return False
+    
+    async def archive_messages(self, session_id: str, messages: List[Dict]) -> None:
+        """Append messages to the session's archive rows"""
+        await self._run(
+            "INSERT INTO session_archive (session_id, data) VALUES (?, ?)",
+            [(session_id, orjson.dumps(message, default=str)) for message in messages],
+            many=True
+        )
+    
+    async def load_archived_messages(self, session_id: str) -> List[Dict]:
+        """Messages older than the session's history buffer, oldest first"""
+        rows = await self._run(
+            "SELECT data FROM session_archive WHERE session_id = ? ORDER BY seq", (session_id,)
+        )
+        return [orjson.loads(data) for (data,) in rows]
+    
+    async def load_session(self, session_id: str) -> Optional[Dict]:
+        """Load session data from SQLite"""
+        try:
+            rows = await self._run("SELECT data FROM sessions WHERE id = ?", (session_id,))
+            if not rows:
+                logger.warning(f"Session {session_id} not found")
+                return None
+            
+            session_data = orjson.loads(rows[0][0])
+            self._restore_types(session_data)
+            
+            logger.info(f"Session {session_id} loaded successfully")
+            return session_data
+        
+        except Exception as e:
+            logger.error(f"Error loading session {session_id}: {e}")
+            return None
+    
+    async def delete_session(self, session_id: str) -> bool:
+        """Delete a session and its archived messages"""
+        try:
+            await self._run("DELETE FROM sessions WHERE id = ?", (session_id,))
+            await self._run("DELETE FROM session_archive WHERE session_id = ?", (session_id,))
+            logger.info(f"Session {session_id} deleted")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting session {session_id}: {e}")
+            return False
+    
+    async def list_sessions(self, limit: Optional[int] = None) -> List[Dict]:
+        """List all sessions, most recently updated first"""
+        rows = await self._run(
+            "SELECT id, created_at, last_updated, phase, ready_for_generation "
+            "FROM sessions ORDER BY last_updated DESC LIMIT ?",
+            (-1 if limit is None else limit,)
+        )
+        return [
+            {
+                "id": session_id,
+                "created_at": created_at,
+                "last_updated": last_updated,
+                "phase": phase,
+                "ready_for_generation": bool(ready)
+            }
+            for session_id, created_at, last_updated, phase, ready in rows
+        ]
+    
+    async def cleanup_old_sessions(self, days: int = 30):
+        """Remove sessions older than specified days"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        rows = await self._run("SELECT id FROM sessions WHERE last_updated < ?", (cutoff,))
+        await self._run(
+            "DELETE FROM session_archive WHERE session_id IN "
+            "(SELECT id FROM sessions WHERE last_updated < ?)",
+            (cutoff,)
+        )
+        await self._run("DELETE FROM sessions WHERE last_updated < ?", (cutoff,))
+        logger.info(f"Cleaned up {len(rows)} old sessions")
+    
+    async def save_user_profile(self, profile: Dict) -> bool:
+        """Save user profile to SQLite"""
+        try:
+            email = profile.get('email', '').lower()
+            if not email:
+                logger.warning("Cannot save user profile without email")
+                return False
+            
+            now = datetime.now().isoformat()
+            profile_data = {**profile, "created_at": now, "last_updated": now}
+            await self._run(
+                "INSERT OR REPLACE INTO users (email, name, business_name, business_type, created_at, last_updated, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    email,
+                    profile.get('name', ''),
+                    profile.get('business_name', ''),
+                    profile.get('business_type', ''),
+                    now,
+                    now,
+                    orjson.dumps(profile_data, default=str)
+                )
+            )
+            
+            logger.info(f"User profile saved for {email}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error saving user profile: {e}")
+            return False
+    
+    async def load_user_profile_by_email(self, email: str) -> Optional[Dict]:
+        """Load user profile by email"""
+        try:
+            rows = await self._run("SELECT data FROM users WHERE email = ?", (email.lower(),))
+            return orjson.loads(rows[0][0]) if rows else None
+        except Exception as e:
+            logger.error(f"Error loading user profile for {email}: {e}")
+            return None
+    
+    async def find_user_by_name(self, name: str) -> Optional[Dict]:
+        """Find user profile by name (case insensitive) through the users_name index"""
+        rows = await self._run("SELECT data FROM users WHERE name = ? LIMIT 1", (name,))
+        return orjson.loads(rows[0][0]) if rows else None
+    
+    async def list_users(self) -> List[Dict]:
+        """List all user profiles"""
+        rows = await self._run(
+            "SELECT email, name, business_name, business_type, created_at, last_updated "
+            "FROM users ORDER BY last_updated DESC"
+        )
+        return [
+            {
+                "email": email,
+                "name": name,
+                "business_name": business_name,
+                "business_type": business_type,
+                "created_at": created_at,
+                "last_updated": last_updated
+            }
+            for email, name, business_name, business_type, created_at, last_updated in rows
+        ]
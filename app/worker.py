@@ -0,0 +1,26 @@
+"""
+MIOSA Generation Worker - Consumes queued generation jobs
+
+Requires SESSION_BACKEND=redis so the worker sees sessions created by the API.
+"""
+
+import asyncio
+import logging
+import socket
+
+from app.core.config import settings
+from app.orchestration.coordinator import ApplicationGenerationCoordinator
+from app.orchestration.generation_queue import GenerationQueue
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+async def run_worker():
+    coordinator = ApplicationGenerationCoordinator()
+    queue = GenerationQueue(settings.REDIS_URL)
+    await queue.run_worker(coordinator, consumer_name=socket.gethostname())
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
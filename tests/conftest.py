@@ -0,0 +1,6 @@
+import os
+
+# Settings requires these; tests never reach the services they configure
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("POSTGRES_PASSWORD", "test")
+os.environ.setdefault("GROQ_API_KEY", "test")
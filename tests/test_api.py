@@ -0,0 +1,24 @@
+"""Request validation on the HTTP API"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_tool_discover_rejects_empty_tool_type():
+    response = client.post("/api/v1/tools/discover", json={"tool_type": ""})
+    
+    assert response.status_code == 422
+
+
+def test_health_timestamp_is_naive_utc():
+    from datetime import datetime, timezone
+    
+    from app.main import _health_timestamp
+    
+    timestamp = datetime.fromisoformat(_health_timestamp())
+    
+    assert timestamp.tzinfo is None
+    assert abs((datetime.now(timezone.utc).replace(tzinfo=None) - timestamp).total_seconds()) < 2
@@ -0,0 +1,81 @@
+"""Concurrent file generation in BackendDeveloperAgent"""
+
+import asyncio
+
+import pytest
+
+from app.agents.backend_developer import BackendDeveloperAgent
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = BackendDeveloperAgent()
+    
+    async def fake_file(*args, **kwargs):
+        return ""
+    
+    for name in (
+        "_generate_fastapi_main", "_generate_config", "_generate_model",
+        "_generate_routes", "_generate_service", "_generate_auth_system", "_generate_requirements"
+    ):
+        monkeypatch.setattr(agent, name, fake_file)
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_duplicate_integration_type_last_wins(agent, monkeypatch):
+    async def fake_integration(integration):
+        return integration["name"]
+    
+    monkeypatch.setattr(agent, "_generate_integration", fake_integration)
+    integrations = [
+        {"type": "crm", "name": "first"},
+        {"type": "email", "name": "mailer"},
+        {"type": "crm", "name": "last"}
+    ]
+    
+    files = await agent._generate_fastapi_files({"tables": []}, {}, integrations)
+    
+    assert files["integrations/crm.py"] == "last"
+    assert files["integrations/email.py"] == "mailer"
+
+
+@pytest.mark.asyncio
+async def test_first_failure_cancels_remaining_files(agent):
+    cancelled = []
+    
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "never"
+    
+    async def failing():
+        raise RuntimeError("LLM call failed")
+    
+    with pytest.raises(RuntimeError, match="LLM call failed"):
+        await agent._gather_files({"slow.py": slow(), "broken.py": failing()})
+    
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_file_calls_share_the_injected_limiter():
+    limiter = asyncio.Semaphore(2)
+    agent = BackendDeveloperAgent(limiter=limiter)
+    running = []
+    peak = []
+    
+    async def file():
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0)
+        running.pop()
+        return ""
+    
+    await agent._gather_files({f"{i}.py": file() for i in range(6)})
+    
+    assert agent.limiter is limiter
+    assert max(peak) == 2
@@ -0,0 +1,59 @@
+"""CLI generation progress follows the coordinator's stage stream"""
+
+import pytest
+
+from app import cli
+from app.cli import MiosaCLI
+
+# Order in which ApplicationGenerationCoordinator.generate_application_stream yields stages
+STREAM_STAGES = ["requirements", "database", "backend", "mcp_connectors", "frontend", "deployment"]
+
+
+class FakeCoordinator:
+    async def generate_application_stream(self, session_id):
+        for stage in STREAM_STAGES:
+            yield {"stage": stage, "result": {}}
+        yield {"stage": "complete", "result": {"project_id": "p1", "components": {}, "summary": ""}}
+
+
+class RecordingProgress:
+    """Stands in for rich's Progress and records every completed value"""
+    
+    def __init__(self, *args, **kwargs):
+        self.completed = []
+    
+    def __enter__(self):
+        recorded.append(self)
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def add_task(self, description, total=100):
+        return 0
+    
+    def update(self, task, completed=None, description=None):
+        if completed is not None:
+            self.completed.append(completed)
+
+
+recorded = []
+
+
+@pytest.mark.asyncio
+async def test_generation_progress_never_decreases(monkeypatch):
+    monkeypatch.setattr(cli, "Progress", RecordingProgress)
+    
+    app_cli = MiosaCLI.__new__(MiosaCLI)
+    app_cli.coordinator = FakeCoordinator()
+    app_cli.session_id = "s1"
+    results = []
+    monkeypatch.setattr(app_cli, "_show_generation_results", results.append)
+    
+    await app_cli._generate_application()
+    
+    assert results and results[0]["status"] == "success"
+    completed = recorded[-1].completed
+    assert len(completed) == len(STREAM_STAGES) + 2
+    assert completed == sorted(completed)
+    assert completed[-1] == 100
@@ -0,0 +1,32 @@
+"""Truthfulness guard on communication agent responses"""
+
+from collections import deque
+
+from app.agents.communication import CommunicationAgent
+from app.orchestration.coordinator import ApplicationGenerationCoordinator
+
+
+CLAIM = "Your app is live at https://example.com. Tell me about your invoices."
+
+
+def _guarded(build_status):
+    coordinator = ApplicationGenerationCoordinator.__new__(ApplicationGenerationCoordinator)
+    session = {
+        "messages": deque(),
+        "background_build": {"status": build_status},
+        "ready_for_generation": True
+    }
+    view = coordinator._communication_view(session)
+    assert view["build_status"] == build_status
+    return CommunicationAgent()._validate_response_truthfulness(CLAIM, view)
+
+
+def test_queued_build_suppresses_deployment_claims():
+    response = _guarded("queued")
+    
+    assert "example.com" not in response
+    assert "invoices" in response
+
+
+def test_guard_sees_the_background_build_status():
+    assert "example.com" in _guarded("plan_ready")
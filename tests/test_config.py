@@ -0,0 +1,13 @@
+"""Settings validation"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+def test_generation_queue_requires_redis_sessions():
+    with pytest.raises(ValidationError, match="SESSION_BACKEND=redis"):
+        Settings(GENERATION_QUEUE=True, SESSION_BACKEND="file")
+    
+    assert Settings(GENERATION_QUEUE=True, SESSION_BACKEND="redis").GENERATION_QUEUE
@@ -0,0 +1,97 @@
+"""Write-behind session flushing in the coordinator"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.orchestration.coordinator import ApplicationGenerationCoordinator
+from app.storage import SessionCache
+
+
+class FakeStorage:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.saved = {}
+        self.marked_during_save = None
+    
+    async def save_session(self, session_id, session):
+        await asyncio.sleep(0)
+        if self.marked_during_save:
+            self.marked_during_save()
+            self.marked_during_save = None
+        if session_id in self.fail:
+            return False
+        self.saved[session_id] = session
+        return True
+
+
+def _coordinator(storage, cache_size=16):
+    coordinator = ApplicationGenerationCoordinator.__new__(ApplicationGenerationCoordinator)
+    coordinator.session_manager = storage
+    coordinator.sessions = SessionCache(cache_size)
+    coordinator._dirty_sessions = {}
+    coordinator._flush_task = None
+    return coordinator
+
+
+@pytest.fixture(autouse=True)
+def fast_flush(monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_FLUSH_INTERVAL", 0)
+
+
+@pytest.mark.asyncio
+async def test_session_marked_during_flush_is_saved():
+    storage = FakeStorage()
+    coordinator = _coordinator(storage)
+    coordinator.sessions["a"] = {"id": "a"}
+    coordinator.sessions["b"] = {"id": "b"}
+    storage.marked_during_save = lambda: coordinator._mark_dirty("b")
+    
+    coordinator._mark_dirty("a")
+    await coordinator._flush_task
+    
+    assert set(storage.saved) == {"a", "b"}
+    assert not coordinator._dirty_sessions
+
+
+@pytest.mark.asyncio
+async def test_failed_save_is_requeued():
+    storage = FakeStorage(fail={"a"})
+    coordinator = _coordinator(storage)
+    coordinator._dirty_sessions["a"] = {"id": "a"}
+    
+    await coordinator.flush_sessions()
+    assert "a" in coordinator._dirty_sessions
+    
+    storage.fail.clear()
+    await coordinator._flush_task
+    assert "a" in storage.saved
+    assert not coordinator._dirty_sessions
+
+
+@pytest.mark.asyncio
+async def test_evicted_session_keeps_its_pending_write():
+    storage = FakeStorage()
+    coordinator = _coordinator(storage, cache_size=1)
+    session = {"id": "a"}
+    coordinator.sessions["a"] = session
+    coordinator._mark_dirty("a")
+    coordinator.sessions["b"] = {"id": "b"}  # evicts "a"
+    
+    coordinator._mark_dirty("a")
+    await coordinator.flush_sessions()
+    
+    assert storage.saved["a"] is session
+
+
+@pytest.mark.asyncio
+async def test_mark_dirty_accepts_a_session_that_left_the_cache():
+    storage = FakeStorage()
+    coordinator = _coordinator(storage, cache_size=1)
+    session = {"id": "a"}
+    
+    coordinator._mark_dirty("a", session)
+    await coordinator.flush_sessions()
+    
+    assert storage.saved["a"] is session
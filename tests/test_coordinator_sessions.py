@@ -0,0 +1,53 @@
+"""Session listing merges storage with the coordinator's in-memory sessions"""
+
+from datetime import datetime
+
+import pytest
+
+from app.orchestration.coordinator import ApplicationGenerationCoordinator
+from app.storage import SessionCache
+
+
+class FakeStorage:
+    def __init__(self, rows):
+        self.rows = rows
+    
+    async def list_sessions(self, limit=None):
+        rows = sorted(self.rows, key=lambda x: x["last_updated"], reverse=True)
+        return rows[:limit]
+
+
+def _row(session_id, last_updated):
+    return {
+        "id": session_id,
+        "created_at": "2026-01-01T00:00:00",
+        "last_updated": last_updated,
+        "phase": "consultation",
+        "ready_for_generation": False
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_sorts_merged_sessions_before_limiting():
+    coordinator = ApplicationGenerationCoordinator.__new__(ApplicationGenerationCoordinator)
+    coordinator.session_manager = FakeStorage([
+        _row("old", "2026-01-02T00:00:00"),
+        _row("newer", "2026-01-05T00:00:00")
+    ])
+    coordinator.sessions = SessionCache()
+    coordinator.sessions["live"] = {
+        "started_at": datetime(2026, 1, 4),
+        "phase": "initial",
+        "ready_for_generation": False
+    }
+    
+    sessions = await coordinator.list_sessions(2)
+    
+    assert [s["id"] for s in sessions] == ["newer", "live"]
+    assert sessions[1] == {
+        "id": "live",
+        "created_at": "2026-01-04T00:00:00",
+        "last_updated": "2026-01-04T00:00:00",
+        "phase": "initial",
+        "ready_for_generation": False
+    }
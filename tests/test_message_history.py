@@ -0,0 +1,21 @@
+"""Bounded message history"""
+
+from app.storage import MessageHistory
+
+
+def test_overflow_on_load_is_kept_for_the_archive():
+    messages = [{"content": str(i)} for i in range(250)]
+    
+    history = MessageHistory(messages, maxlen=200)
+    
+    assert list(history) == messages[50:]
+    assert history.take_evicted() == messages[:50]
+
+
+def test_append_past_maxlen_records_the_evicted_message():
+    history = MessageHistory([{"content": "a"}], maxlen=1)
+    
+    history.append({"content": "b"})
+    
+    assert list(history) == [{"content": "b"}]
+    assert history.evicted == [{"content": "a"}]
@@ -0,0 +1,53 @@
+"""Sessions and profiles shared by several workers through Redis"""
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.core.config import settings
+from app.core.onboarding import OnboardingStep
+from app.orchestration.coordinator import ApplicationGenerationCoordinator
+
+
+@pytest.fixture
+def workers(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "SESSION_BACKEND", "redis")
+    monkeypatch.chdir(tmp_path)
+    server = fakeredis.FakeServer()
+    
+    def worker():
+        coordinator = ApplicationGenerationCoordinator()
+        coordinator.session_manager.redis = fakeredis.aioredis.FakeRedis(server=server)
+        return coordinator
+    
+    return worker(), worker()
+
+
+@pytest.mark.asyncio
+async def test_turns_alternating_between_workers_are_kept(workers):
+    a, b = workers
+    
+    await a.start_consultation("s1", "Ann")
+    await b.continue_consultation("s1", "ann@example.com")
+    await a.continue_consultation("s1", "Acme Plumbing")
+    
+    stored = await b.session_manager.load_session("s1")
+    assert stored["user_profile"]["email"] == "ann@example.com"
+    assert stored["onboarding_step"] not in (OnboardingStep.NAME, OnboardingStep.EMAIL)
+    assert [m["content"] for m in stored["messages"] if m["role"] == "user"] == [
+        "Ann", "ann@example.com", "Acme Plumbing"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_profiles_are_visible_to_every_worker(workers):
+    a, b = workers
+    
+    await a.session_manager.save_user_profile({"email": "Ann@Example.com", "name": "Ann"})
+    await b.session_manager.save_user_profile({"email": "bo@example.com", "name": "Bo"})
+    
+    assert (await b.session_manager.find_user_by_name("ann"))["email"] == "Ann@Example.com"
+    assert (await a.session_manager.load_user_profile_by_email("BO@example.com"))["name"] == "Bo"
+    assert {user["email"] for user in await a.session_manager.list_users()} == {
+        "ann@example.com", "bo@example.com"
+    }
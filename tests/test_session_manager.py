@@ -0,0 +1,19 @@
+"""File session storage"""
+
+import pytest
+
+from app.storage import SessionManager
+
+
+@pytest.mark.asyncio
+async def test_export_import_keeps_archived_messages(tmp_path):
+    manager = SessionManager(str(tmp_path / "sessions"))
+    await manager.save_session("s1", {"id": "s1", "started_at": "2026-01-01T00:00:00", "messages": []})
+    await manager.archive_messages("s1", [{"role": "user", "content": "first"}])
+    
+    export_file = tmp_path / "export" / "s1.json"
+    assert await manager.export_session("s1", str(export_file))
+    imported = await manager.import_session(str(export_file))
+    
+    assert await manager.load_archived_messages(imported) == [{"role": "user", "content": "first"}]
+    await manager.flush()